@@ -0,0 +1,95 @@
+"""
+Memory benchmark for generated Python commands.
+
+Generates the `python` and `pythoncompact` targets from a command JSON file
+into a temporary folder, then builds many instances of one command with each
+and reports the memory they hold.
+
+Example:
+    python benchmarks/python_memory.py -s examples/example.json -c ExampleCommand
+"""
+import sys
+import json
+import argparse
+import importlib
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from language_plugins.base_language_plugin import BaseLanguagePlugin  # noqa: E402
+from language_plugins.python.python_language_plugin import (  # noqa: E402
+    PythonLanguagePlugin,
+    PythonCompactLanguagePlugin,
+)
+from payload_generator import generate_records, parse_length_distribution  # noqa: E402
+
+# Number of distinct payloads; instances repeat them, so field values repeat
+SAMPLE_COUNT = 3
+
+
+def build_sample_payloads(json_data: dict, source_name: str, command_name: str) -> list[str]:
+    """
+    Build a few JSON payloads for the command with repeating field values.
+    """
+    commands = BaseLanguagePlugin().parse_json_data({source_name: json_data})[source_name]
+    command = next((c for c in commands if c.name == command_name), None)
+    if command is None:
+        raise ValueError(f"Unknown command '{command_name}'.")
+
+    records = generate_records(
+        [command], SAMPLE_COUNT, seed=0, optional_density=1.0,
+        string_length=parse_length_distribution("fixed:8"),
+        array_length=parse_length_distribution("fixed:16"))
+    return [json.dumps(message) for _, message in records]
+
+
+def measure(cls, payloads: list[str], count: int) -> tuple[int, float]:
+    """
+    Decode `count` instances and return (bytes held, bytes per instance).
+    """
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    instances = [cls.from_json(payloads[i % len(payloads)])
+                 for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    held = current - baseline
+    del instances
+    return held, held / count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare memory use of python and pythoncompact commands.")
+    parser.add_argument("-s", "--source", type=Path, required=True,
+                        help="Command JSON file")
+    parser.add_argument("-c", "--command", required=True,
+                        help="Name of the command to instantiate")
+    parser.add_argument("-n", "--count", type=int, default=1_000_000,
+                        help="Number of instances to build (default: 1000000)")
+    args = parser.parse_args()
+
+    with args.source.open("r", encoding="utf-8") as f:
+        json_data = json.load(f)
+    payloads = build_sample_payloads(json_data, args.source.stem, args.command)
+
+    with tempfile.TemporaryDirectory() as build_root:
+        sys.path.insert(0, build_root)
+        for plugin_cls in (PythonLanguagePlugin, PythonCompactLanguagePlugin):
+            plugin = plugin_cls()
+            plugin.generate({args.source.stem: json_data}, Path(build_root))
+
+            module = importlib.import_module(
+                f"{plugin.output_folder}.{args.source.stem}")
+            cls = getattr(module, args.command)
+
+            held, per_instance = measure(cls, payloads, args.count)
+            print(f"{plugin.output_folder:>16}: {held / 1e6:10.1f} MB "
+                  f"({per_instance:.1f} B/instance)")
+
+
+if __name__ == "__main__":
+    main()
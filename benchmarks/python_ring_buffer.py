@@ -0,0 +1,152 @@
+"""
+Throughput and latency benchmark for the Python shared-memory ring buffer.
+
+Generates the `python` target from a command JSON file into a temporary
+folder, then streams encoded commands from this process to a consumer
+process through `shm_ring.RingBuffer`. The consumer is started as a separate
+program (not forked) like an independent worker would be, and the run fails
+if the shared memory does not outlive it.
+
+Example:
+    python benchmarks/python_ring_buffer.py -s examples/example.json -c ExampleCommand
+"""
+import sys
+import json
+import time
+import struct
+import argparse
+import importlib
+import statistics
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from language_plugins.base_language_plugin import BaseLanguagePlugin  # noqa: E402
+from language_plugins.python.python_language_plugin import PythonLanguagePlugin  # noqa: E402
+from payload_generator import generate_records, parse_length_distribution  # noqa: E402
+
+# Each payload is prefixed with the send time so the consumer can measure
+# latency. perf_counter_ns uses a system-wide monotonic clock on Linux.
+_SEND_TIME = struct.Struct("<q")
+
+
+def consume(build_root: str, ring_name: str, count: int, batch: int,
+            wait: str) -> tuple[int, list[int]]:
+    sys.path.insert(0, build_root)
+    shm_ring = importlib.import_module("python.shm_ring")
+    lazy = importlib.import_module("python.lazy")
+
+    # Started as its own program, so the segment must not be tracked here
+    ring = shm_ring.RingBuffer.attach(ring_name, track=False, wait=wait)
+    latencies = []
+    received = 0
+    start = None
+    while received < count:
+        for payload in ring.get_many(batch):
+            now = time.perf_counter_ns()
+            if start is None:
+                start = now
+            sent = _SEND_TIME.unpack_from(payload)[0]
+            latencies.append(now - sent)
+            # Route on the command name like a forwarding stage would
+            lazy.LazyCommand(payload[_SEND_TIME.size:]).command_name
+            received += 1
+    elapsed = time.perf_counter_ns() - start
+    ring.close()
+    return elapsed, latencies
+
+
+def build_command(module, json_data: dict, source_name: str, command_name: str):
+    commands = BaseLanguagePlugin().parse_json_data({source_name: json_data})[source_name]
+    command = next((c for c in commands if c.name == command_name), None)
+    if command is None:
+        raise ValueError(f"Unknown command '{command_name}'.")
+
+    _, message = next(generate_records(
+        [command], 1, seed=0, optional_density=1.0,
+        string_length=parse_length_distribution("fixed:9"),
+        array_length=parse_length_distribution("fixed:16")))
+    return getattr(module, command_name).from_dict(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure ring buffer throughput and latency between two processes.")
+    parser.add_argument("-s", "--source", type=Path, required=True,
+                        help="Command JSON file")
+    parser.add_argument("-c", "--command", required=True,
+                        help="Name of the command to send")
+    parser.add_argument("-n", "--count", type=int, default=200_000,
+                        help="Number of commands to send (default: 200000)")
+    parser.add_argument("--batch", type=int, default=64,
+                        help="Commands per put_many/get_many batch (default: 64)")
+    parser.add_argument("--capacity", type=int, default=1 << 20,
+                        help="Ring buffer size in bytes (default: 1 MiB)")
+    parser.add_argument("--wait", choices=["spin", "backoff"], default="spin",
+                        help="Wait strategy (default: spin)")
+    # Used when this script starts itself as the consumer process
+    parser.add_argument("--consumer", metavar="RING_NAME", help=argparse.SUPPRESS)
+    parser.add_argument("--build-root", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.consumer:
+        elapsed, latencies = consume(
+            args.build_root, args.consumer, args.count, args.batch, args.wait)
+        json.dump({"elapsed": elapsed, "latencies": latencies}, sys.stdout)
+        return
+
+    with args.source.open("r", encoding="utf-8") as f:
+        json_data = json.load(f)
+
+    with tempfile.TemporaryDirectory() as build_root:
+        PythonLanguagePlugin().generate(
+            {args.source.stem: json_data}, Path(build_root))
+        sys.path.insert(0, build_root)
+        shm_ring = importlib.import_module("python.shm_ring")
+        module = importlib.import_module(f"python.{args.source.stem}")
+
+        encoded = build_command(module, json_data, args.source.stem, args.command).to_json(
+            indent=None).encode("utf-8")
+
+        with shm_ring.RingBuffer.create(args.capacity, wait=args.wait) as ring:
+            consumer = subprocess.Popen(
+                [sys.executable, __file__,
+                 "-s", str(args.source), "-c", args.command,
+                 "-n", str(args.count), "--batch", str(args.batch),
+                 "--wait", args.wait,
+                 "--consumer", ring.name, "--build-root", build_root],
+                stdout=subprocess.PIPE, text=True)
+
+            sent = 0
+            while sent < args.count:
+                batch_size = min(args.batch, args.count - sent)
+                ring.put_many(
+                    _SEND_TIME.pack(time.perf_counter_ns()) + encoded
+                    for _ in range(batch_size))
+                sent += batch_size
+
+            output, _ = consumer.communicate()
+            if consumer.returncode != 0:
+                raise RuntimeError(
+                    f"Consumer process failed with exit code {consumer.returncode}.")
+            result = json.loads(output)
+            elapsed, latencies = result["elapsed"], result["latencies"]
+
+            # The consumer exited with its own resource tracker; the segment
+            # must still be there for other consumers and for the creator
+            shm_ring.RingBuffer.attach(ring.name).close()
+
+    latencies.sort()
+    seconds = elapsed / 1e9
+    print(f"payload size: {len(encoded)} B, batch: {args.batch}, wait: {args.wait}")
+    print(f"throughput:   {args.count / seconds:,.0f} commands/s "
+          f"({args.count * len(encoded) / seconds / 1e6:.1f} MB/s)")
+    print(f"latency:      p50 {statistics.median(latencies) / 1e3:.1f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] / 1e3:.1f} us, "
+          f"max {latencies[-1] / 1e3:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
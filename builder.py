@@ -1,9 +1,16 @@
+import io
+import sys
 import json
+import hashlib
 import argparse
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
 
 import language_plugins
 from language_plugins.base_language_plugin import BaseLanguagePlugin
+from language_plugins.command_definitions import Command
 
 
 def load_plugins() -> dict[str, type[BaseLanguagePlugin]]:
@@ -17,24 +24,77 @@ def load_plugins() -> dict[str, type[BaseLanguagePlugin]]:
     return plugins
 
 
-def main():
+class SchemaCache:
+    """
+    Parsed commands per source JSON file, reused until the file's
+    modification time or size changes.
+    """
+
+    def __init__(self):
+        self._entries: dict[Path, tuple[tuple[int, int], list[Command]]] = {}
+        self._parser = BaseLanguagePlugin()
+
+    def load(self, json_files: dict[str, Path], jobs: int | None = None) -> dict[str, list[Command]]:
+        """
+        Return the parsed commands of every file, reading and parsing the
+        files that changed concurrently on up to `jobs` threads.
+        """
+        stale_files: list[tuple[str, Path, Path, tuple[int, int]]] = []
+        for filename, path in json_files.items():
+            stat = path.stat()
+            file_key = (stat.st_mtime_ns, stat.st_size)
+            resolved = path.resolve()
+
+            cached = self._entries.get(resolved)
+            if cached is None or cached[0] != file_key:
+                stale_files.append((filename, path, resolved, file_key))
+
+        if stale_files:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                parsed_files = executor.map(
+                    lambda stale: self._parse_file(stale[0], stale[1]), stale_files)
+                for (_, _, resolved, file_key), commands in zip(stale_files, parsed_files):
+                    self._entries[resolved] = (file_key, commands)
+
+        return {
+            filename: self._entries[path.resolve()][1]
+            for filename, path in json_files.items()
+        }
+
+    def _parse_file(self, filename: str, path: Path) -> list[Command]:
+        with path.open("r", encoding="utf-8") as f:
+            json_data = json.load(f)
+        return self._parser.parse_json_data({filename: json_data})[filename]
+
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description=(
             "Generate language-specific code from command JSON files.\n"
             "You can provide a single JSON file or a folder containing multiple JSON files.\n"
-            "By default, code will be generated for all available languages unless -l is specified."
+            "By default, code will be generated for all available languages unless -l is specified.\n"
+            "Opt-in targets are only generated when selected with -l."
         ),
-        formatter_class=argparse.RawTextHelpFormatter
+        formatter_class=argparse.RawTextHelpFormatter,
+        fromfile_prefix_chars="@"
     )
     parser.add_argument(
         "-s", "--source",
-        required=True,
         type=Path,
         help="Path to the source JSON file or folder containing JSON files"
     )
     parser.add_argument(
         "-b", "--build",
-        required=True,
         type=Path,
         help="Path to the build output directory"
     )
@@ -42,7 +102,65 @@ def main():
         "-l", "--language",
         help=(
             "Target language to generate (e.g., python, csharp).\n"
-            "Default: generate all available languages"
+            "Default: generate all available languages except the opt-in\n"
+            "targets (pythoncompact, cppembedded), which must be selected here"
+        )
+    )
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help=(
+            "Search the source folder recursively. Outputs mirror the folder\n"
+            "structure of the sources"
+        )
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help=(
+            "Glob matched against each file's name or path relative to the source\n"
+            "folder. May be repeated. Default: *.json"
+        )
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Glob of files to skip, matched like --include. May be repeated"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=positive_int,
+        help="Number of threads used to read and parse JSON files"
+    )
+    parser.add_argument(
+        "--depfile",
+        type=Path,
+        help=(
+            "Write a Make/Ninja style depfile listing every source JSON, plugin module\n"
+            "and static file read. The target is the stamp file if --stamp is given,\n"
+            "otherwise every generated output"
+        )
+    )
+    parser.add_argument(
+        "--stamp",
+        type=Path,
+        help=(
+            "Write a digest of all generated outputs to this file. The stamp is touched\n"
+            "on every run so it is newer than the inputs. Generated files are only\n"
+            "rewritten when their content changed, so steps depending on them directly\n"
+            "are not rerun needlessly"
+        )
+    )
+    parser.add_argument(
+        "--persistent-worker", "--persistent_worker",
+        action="store_true",
+        help=(
+            "Run as a persistent build worker. Reads one JSON work request per line\n"
+            "on stdin ({\"arguments\": [...], \"requestId\": N}) and writes one JSON\n"
+            "response per line on stdout ({\"exitCode\": N, \"output\": str, \"requestId\": N})"
         )
     )
     parser.add_argument(
@@ -51,47 +169,197 @@ def main():
         version="Code Generator 1.0",
         help="Show the generator version and exit"
     )
+    return parser
 
-    args = parser.parse_args()
 
-    # Gather JSON files
+def _matches_any(relative_path: str, patterns: list[str]) -> bool:
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(fnmatch(relative_path, p) or fnmatch(name, p) for p in patterns)
+
+
+def gather_json_files(source: Path, recursive: bool = False,
+                      include: list[str] | None = None,
+                      exclude: list[str] | None = None) -> dict[str, Path]:
+    """
+    Find the source JSON files, keyed by their path relative to `source`
+    without the suffix (e.g. "team_a/motors"). Output files use the same key,
+    so a key may not also be the folder of another key ("motors" and
+    "motors/frames"): the output folder would shadow the output file.
+    """
+    include = include or ["*.json"]
+    exclude = exclude or []
+
     json_files = {}
-    if args.source.is_file() and args.source.suffix.lower() == ".json":
-        json_files[args.source.stem] = args.source
-    elif args.source.is_dir():
-        for file_path in args.source.glob("*.json"):
-            json_files[file_path.stem] = file_path
+    if source.is_file() and source.suffix.lower() == ".json":
+        json_files[source.stem] = source
+    elif source.is_dir():
+        candidates = source.rglob("*") if recursive else source.iterdir()
+        for file_path in sorted(candidates):
+            if not file_path.is_file():
+                continue
+            relative_path = file_path.relative_to(source).as_posix()
+            if not _matches_any(relative_path, include) or _matches_any(relative_path, exclude):
+                continue
+
+            key = file_path.relative_to(source).with_suffix("").as_posix()
+            if key in json_files:
+                raise ValueError(
+                    f"Source files '{json_files[key]}' and '{file_path}' would generate the same output '{key}'.")
+            json_files[key] = file_path
         if not json_files:
-            raise ValueError(f"No JSON files found in folder '{args.source}'.")
+            raise ValueError(f"No JSON files found in folder '{source}'.")
+
+        for key, file_path in json_files.items():
+            for folder in PurePosixPath(key).parents:
+                if str(folder) in json_files:
+                    raise ValueError(
+                        f"Source file '{json_files[str(folder)]}' and '{file_path}' would generate "
+                        f"both an output '{folder}' and a folder of the same name.")
     else:
         raise ValueError(
-            f"Source must be a JSON file or folder, got '{args.source}'.")
+            f"Source must be a JSON file or folder, got '{source}'.")
+    return json_files
 
-    # Load JSON content into dict
-    all_json_data = {}
-    for filename, path in json_files.items():
-        with path.open("r", encoding="utf-8") as f:
-            all_json_data[filename] = json.load(f)
 
-    plugins = load_plugins()
+def select_plugins(plugins: dict[str, type[BaseLanguagePlugin]], language: str | None) -> dict[str, type[BaseLanguagePlugin]]:
     if not plugins:
         raise RuntimeError("No language plugins registered.")
 
-    if args.language:
-        lang_key = args.language.lower()
+    if language:
+        lang_key = language.lower()
         if lang_key not in plugins:
-            raise ValueError(f"Unsupported language '{args.language}'.")
-        selected_plugins = {lang_key: plugins[lang_key]}
-    else:
-        selected_plugins = plugins
+            raise ValueError(f"Unsupported language '{language}'.")
+        return {lang_key: plugins[lang_key]}
+    return {lang_key: plugin_cls for lang_key, plugin_cls in plugins.items()
+            if plugin_cls.default_enabled}
+
+
+def validate_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.source is None or args.build is None:
+        parser.error("the following arguments are required: -s/--source, -b/--build")
+
+
+def _escape_depfile_path(path: Path) -> str:
+    return (
+        str(path)
+        .replace("\\", "/")
+        .replace("$", "$$")
+        .replace("#", "\\#")
+        .replace(" ", "\\ ")
+    )
+
+
+def write_depfile(depfile: Path, targets: list[Path], dependencies: list[Path]) -> None:
+    """
+    Write a Make/Ninja style depfile: `targets: dependencies`.
+    """
+    target_str = " ".join(_escape_depfile_path(t) for t in targets)
+    lines = [f"{target_str}:"]
+    for dependency in dict.fromkeys(dependencies):
+        lines.append(f" {_escape_depfile_path(dependency)}")
+
+    depfile.parent.mkdir(parents=True, exist_ok=True)
+    depfile.write_text(" \\\n".join(lines) + "\n", encoding="utf-8")
+
+
+def write_stamp(stamp: Path, outputs: list[Path]) -> bool:
+    """
+    Write a digest of the outputs' names and contents to `stamp`. The stamp
+    is touched even if the digest did not change, so build tools without
+    restat support see it as newer than the inputs.
+    Returns True if the digest changed.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(set(outputs)):
+        digest.update(path.as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    new_stamp = digest.hexdigest() + "\n"
+
+    if stamp.is_file() and stamp.read_text(encoding="utf-8") == new_stamp:
+        stamp.touch()
+        return False
 
-    # Pass the dict of all JSON files to each plugin
+    stamp.parent.mkdir(parents=True, exist_ok=True)
+    stamp.write_text(new_stamp, encoding="utf-8")
+    return True
+
+
+def run(args: argparse.Namespace, plugins: dict[str, type[BaseLanguagePlugin]], schema_cache: SchemaCache) -> None:
+    json_files = gather_json_files(
+        args.source, args.recursive, args.include, args.exclude)
+    parsed_json_data = schema_cache.load(json_files, args.jobs)
+    selected_plugins = select_plugins(plugins, args.language)
+
+    input_files: list[Path] = list(json_files.values())
+    output_files: list[Path] = []
+
+    # Pass the parsed commands of all JSON files to each plugin
     for lang, plugin_cls in selected_plugins.items():
         print(f"Generating {lang}...")
         plugin = plugin_cls()
-        plugin.generate(all_json_data, args.build)
+        output_files.extend(
+            plugin.generate_from_commands(parsed_json_data, args.build))
+        input_files.extend(plugin.get_input_files())
         print(f"{lang} generation complete.")
 
+    if args.stamp:
+        if write_stamp(args.stamp, output_files):
+            print(f"Updated stamp '{args.stamp}'.")
+
+    if args.depfile:
+        targets = [args.stamp] if args.stamp else output_files
+        write_depfile(args.depfile, targets, input_files)
+
+
+def run_persistent_worker(parser: argparse.ArgumentParser, stdin=sys.stdin, stdout=sys.stdout) -> None:
+    """
+    Serve work requests until stdin closes, keeping the plugins and the
+    parsed schemas loaded between requests.
+    """
+    plugins = load_plugins()
+    schema_cache = SchemaCache()
+
+    for line in stdin:
+        if not line.strip():
+            continue
+
+        request_id = 0
+        output = io.StringIO()
+        exit_code = 0
+        try:
+            request = json.loads(line)
+            request_id = request.get("requestId", 0)
+            with redirect_stdout(output), redirect_stderr(output):
+                args = parser.parse_args(request.get("arguments", []))
+                validate_args(parser, args)
+                run(args, plugins, schema_cache)
+        except SystemExit as e:
+            # argparse reports bad arguments by exiting
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            output.write(f"{type(e).__name__}: {e}\n")
+            exit_code = 1
+
+        response = {
+            "exitCode": exit_code,
+            "output": output.getvalue(),
+            "requestId": request_id,
+        }
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+
+def main():
+    parser = build_arg_parser()
+    args = parser.parse_args()
+
+    if args.persistent_worker:
+        run_persistent_worker(parser)
+        return
+
+    validate_args(parser, args)
+    run(args, load_plugins(), SchemaCache())
+
 
 if __name__ == "__main__":
     main()
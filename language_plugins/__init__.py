@@ -1,11 +1,13 @@
-from .cplusplus.cplusplus_language_plugin import CppLanguagePlugin
+from .cplusplus.cplusplus_language_plugin import CppLanguagePlugin, CppEmbeddedLanguagePlugin
 from .csharp.csharp_language_plugin import CSharpLanguagePlugin
 from .javascript.javascript_language_plugin import JavaScriptLanguagePlugin
-from .python.python_language_plugin import PythonLanguagePlugin
+from .python.python_language_plugin import PythonLanguagePlugin, PythonCompactLanguagePlugin
 
 __all__ = [
     "CppLanguagePlugin",
+    "CppEmbeddedLanguagePlugin",
     "CSharpLanguagePlugin",
     "JavaScriptLanguagePlugin",
-    "PythonLanguagePlugin"
+    "PythonLanguagePlugin",
+    "PythonCompactLanguagePlugin"
 ]
@@ -1,10 +1,18 @@
 from pathlib import Path
 from typing import Dict, Any
-import shutil
+import re
+import sys
 
 from .base_snippets import Snippets
 from .command_definitions import Command, CommandEntry, EntryType
 
+# Bytecode left in the static folders when the Python runtime is imported
+# from this repository (e.g. by payload_generator.py) is never shipped
+IGNORED_STATIC_FILES = ("__pycache__", "*.pyc")
+
+# "float32[]" is a variable length array, "float32[16]" a fixed length one
+ARRAY_TYPE_PATTERN = re.compile(r"^(\w+)\[(\d*)\]$")
+
 
 class BaseLanguagePlugin:
     """
@@ -14,14 +22,27 @@ class BaseLanguagePlugin:
     file_ending: str
     static_file_path: str
     snippets: Snippets
+    # Opt-in targets set this to False and are only generated when selected
+    # explicitly with -l
+    default_enabled: bool = True
 
-    def generate(self, all_json_data: Dict[str, Dict[str, Any]], build_root: Path) -> None:
+    def generate(self, all_json_data: Dict[str, Dict[str, Any]], build_root: Path) -> list[Path]:
         """
         Orchestrates generation:
         - validates ABOUT sections
         - creates language subfolder
         - calls generate_code()
         - writes all output files
+        Returns the paths of every output file.
+        """
+        return self.generate_from_commands(
+            self.parse_json_data(all_json_data), build_root)
+
+    def parse_json_data(self, all_json_data: Dict[str, Dict[str, Any]]) -> Dict[str, list[Command]]:
+        """
+        Validate the raw JSON of each source file and parse it into commands.
+        The result does not depend on the plugin, so it can be shared between
+        plugins and reused across runs.
         """
         # Validate each JSON file
         for filename, data in all_json_data.items():
@@ -32,24 +53,66 @@ class BaseLanguagePlugin:
         for file_name, json_contents in all_json_data.items():
             parsed_json_data[file_name] = self._convert_json_to_commands(
                 json_contents)
+        return parsed_json_data
 
+    def generate_from_commands(self, parsed_json_data: Dict[str, list[Command]], build_root: Path) -> list[Path]:
+        """
+        Generate and write the output files from already parsed commands.
+        Returns the paths of every output file, written or left unchanged.
+        """
         # Plugin returns dict: {filename -> content}
         files_dict = self._generate_code(parsed_json_data)
 
-        # delete any existing build folder
         output_dir = build_root / self.output_folder
-        self._remove_existing_build_folder(output_dir)
 
-        # remake the build folder
+        # A generated file must not be replaced by a static runtime file
+        # (e.g. a source named "metrics.json" in the Python target)
+        static_dir = Path(self.static_file_path)
+        for static_file in self._get_static_files(static_dir):
+            filename = static_file.as_posix()
+            if filename in files_dict:
+                raise ValueError(
+                    f"Generated file '{filename}' and static file '{static_dir / static_file}' "
+                    f"would generate the same output '{output_dir / filename}'.")
+
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # save the new files to the build folder
+        # Files are only rewritten when their content changed, so unchanged
+        # outputs keep their modification time and dependent build steps
+        # are not rerun
+        written_files: list[Path] = []
         for filename, content in files_dict.items():
             file_path = output_dir / filename
-            file_path.write_text(content, encoding="utf-8")
+            self._write_if_changed(file_path, content.encode("utf-8"))
+            written_files.append(file_path)
 
         # copy any static files from the static folder into the build folder
-        self._copy_static_files(self.static_file_path, output_dir)
+        written_files.extend(
+            self._copy_static_files(self.static_file_path, output_dir))
+
+        # delete anything left over from earlier runs
+        self._remove_stale_files(output_dir, written_files)
+        return written_files
+
+    def get_input_files(self) -> list[Path]:
+        """
+        List the files that generation reads besides the source JSON:
+        the plugin and snippet modules (including their base classes) and
+        every static file.
+        """
+        package = __name__.split(".")[0]
+        classes = (*type(self).__mro__, *type(self.snippets).__mro__, Command)
+        module_names = sorted({
+            cls.__module__ for cls in classes
+            if cls.__module__.split(".")[0] == package
+        })
+        input_files = [Path(sys.modules[name].__file__)
+                       for name in module_names]
+
+        static_dir = Path(self.static_file_path)
+        input_files.extend(
+            static_dir / path for path in self._get_static_files(static_dir))
+        return input_files
 
     def _generate_code(self, all_json_data: Dict[str, list[Command]]) -> Dict[str, str]:
         """
@@ -58,30 +121,49 @@ class BaseLanguagePlugin:
         """
         output_files = {}
 
-        # Generate code per JSON source file
+        # Generate code per JSON source file. Source names may contain
+        # folders ("team_a/motors") which are mirrored in the output
         for source_filename, commands in all_json_data.items():
+            depth = source_filename.count("/")
             output_files[f"{source_filename}.{self.file_ending}"] = self.snippets.get_file_snippet(
-                commands)
+                commands, depth)
 
         return output_files
 
-    def _remove_existing_build_folder(self, build_dir: str) -> None:
-        path = Path(build_dir)
-
-        if not path.exists() or not path.is_dir():
-            return
-
-        try:
-            # Recursively remove the directory and all its contents
-            shutil.rmtree(path)
-            print(
-                f"'{path}' has been deleted.")
-        except OSError as e:
-            print(f"Error: {path} : {e.strerror}")
+    @staticmethod
+    def _write_if_changed(path: Path, data: bytes) -> bool:
+        """
+        Write `data` to `path` unless the file already holds exactly that.
+        Returns True if the file was written.
+        """
+        if path.is_file() and path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return True
 
-    def _copy_static_files(self, static_file_dir: str, output_dir: str) -> None:
+    def _remove_stale_files(self, output_dir: Path, keep: list[Path]) -> None:
+        """
+        Delete every file in `output_dir` that is not in `keep`, then any
+        folders left empty.
+        """
+        keep_set = set(keep)
+        for path in sorted(output_dir.rglob("*"), reverse=True):
+            try:
+                if path.is_dir() and not path.is_symlink():
+                    if not any(path.iterdir()):
+                        path.rmdir()
+                elif path not in keep_set:
+                    path.unlink()
+                    print(f"'{path}' has been deleted.")
+            except OSError as e:
+                print(f"Error: {path} : {e.strerror}")
+
+    def _get_static_files(self, static_file_dir: str) -> list[Path]:
+        """
+        List the static files, relative to `static_file_dir`.
+        """
         src = Path(static_file_dir)
-        dst = Path(output_dir)
 
         if not src.exists():
             raise FileNotFoundError(
@@ -91,17 +173,30 @@ class BaseLanguagePlugin:
             raise NotADirectoryError(
                 f"Static file path is not a directory: {src}")
 
-        dst.mkdir(parents=True, exist_ok=True)
+        return [
+            path.relative_to(src) for path in sorted(src.rglob("*"))
+            if path.is_file() and not self._is_ignored_static_file(path.relative_to(src))
+        ]
 
-        for item in src.iterdir():
-            target = dst / item.name
+    def _copy_static_files(self, static_file_dir: str, output_dir: str) -> list[Path]:
+        src = Path(static_file_dir)
+        dst = Path(output_dir)
 
-            if item.is_dir():
-                # Copy directory tree (merge into existing directory)
-                shutil.copytree(item, target, dirs_exist_ok=True)
-            else:
-                # Copy file, overwrite if it exists
-                shutil.copy2(item, target)
+        copied_files: list[Path] = []
+        for relative_path in self._get_static_files(src):
+            # Copy file, overwrite if its content differs
+            target = dst / relative_path
+            self._write_if_changed(target, (src / relative_path).read_bytes())
+            copied_files.append(target)
+        return copied_files
+
+    @staticmethod
+    def _is_ignored_static_file(relative_path: Path) -> bool:
+        return any(
+            part_path.match(pattern)
+            for part_path in (Path(part) for part in relative_path.parts)
+            for pattern in IGNORED_STATIC_FILES
+        )
 
     def _convert_json_to_commands(self, single_json_file: Dict[str, Any]) -> list[Command]:
         parsed_commands: list[Command] = []
@@ -117,20 +212,52 @@ class BaseLanguagePlugin:
                 type_str: str = field_info["type"]
                 comment: str = field_info["comment"]
                 optional: bool = field_info.get("optional", False)
+                max_length = field_info.get("max_length")
+
+                array_match = ARRAY_TYPE_PATTERN.match(type_str)
+                element_type_str = array_match.group(1) if array_match else type_str
 
                 try:
-                    entry_type = EntryType(type_str)
+                    entry_type = EntryType(element_type_str)
                 except ValueError:
                     raise ValueError(
                         f"Unknown type '{type_str}' in command '{command_name}', field '{field_name}'."
                     )
 
+                array_length = None
+                if array_match:
+                    if not entry_type.is_sized_numeric:
+                        raise ValueError(
+                            f"Array type '{type_str}' in command '{command_name}', field '{field_name}' "
+                            "must use a sized numeric element type (e.g. float32, uint8)."
+                        )
+                    if array_match.group(2):
+                        array_length = int(array_match.group(2))
+                        if array_length == 0:
+                            raise ValueError(
+                                f"Array type '{type_str}' in command '{command_name}', field '{field_name}' "
+                                "must have a positive length."
+                            )
+
+                if max_length is not None:
+                    if entry_type != EntryType.STRING or array_match:
+                        raise ValueError(
+                            f"'max_length' is only allowed on str fields (command '{command_name}', field '{field_name}')."
+                        )
+                    if type(max_length) is not int or max_length < 1:
+                        raise ValueError(
+                            f"'max_length' of command '{command_name}', field '{field_name}' must be a positive integer."
+                        )
+
                 entries.append(
                     CommandEntry(
                         name=field_name,
                         type=entry_type,
                         comment=comment,
                         optional=optional,
+                        is_array=array_match is not None,
+                        array_length=array_length,
+                        max_length=max_length,
                     )
                 )
 
@@ -77,12 +77,14 @@ class Snippets(ABC):
             return "\n".join(self.indent_snippet(snippet, indents))
 
     @abstractmethod
-    def get_file_snippet(self, commands: list[Command]) -> str:
+    def get_file_snippet(self, commands: list[Command], depth: int = 0) -> str:
         """
         Generate the full contents of a source file for the given commands.
 
         Args:
             commands (list[Command]): List of Command objects to render.
+            depth (int): Number of folders between the file and the root of
+                the output folder, for languages with relative imports.
 
         Returns:
             str: Full file content as a string.
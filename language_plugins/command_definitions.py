@@ -1,5 +1,6 @@
 from enum import Enum
 from dataclasses import dataclass
+from typing import Optional
 
 
 class EntryType(Enum):
@@ -8,6 +9,22 @@ class EntryType(Enum):
     FLOAT = "float"
     BOOL = "bool"
 
+    # Fixed-width numeric types
+    INT8 = "int8"
+    INT16 = "int16"
+    INT32 = "int32"
+    INT64 = "int64"
+    UINT8 = "uint8"
+    UINT16 = "uint16"
+    UINT32 = "uint32"
+    UINT64 = "uint64"
+    FLOAT32 = "float32"
+    FLOAT64 = "float64"
+
+    @property
+    def is_sized_numeric(self) -> bool:
+        return self not in (EntryType.STRING, EntryType.INT, EntryType.FLOAT, EntryType.BOOL)
+
 
 @dataclass
 class CommandEntry:
@@ -15,6 +32,11 @@ class CommandEntry:
     type: EntryType
     comment: str
     optional: bool = False
+    # Homogeneous array of `type`, written as "type[]" or "type[N]" in the JSON
+    is_array: bool = False
+    array_length: Optional[int] = None
+    # Maximum string length, used by targets with fixed-capacity strings
+    max_length: Optional[int] = None
 
 
 @dataclass
@@ -2,7 +2,7 @@ from pathlib import Path
 
 from language_plugins.base_language_plugin import BaseLanguagePlugin
 from language_plugins.base_snippets import Snippets
-from .cplusplus_snippets import CppSnippet
+from .cplusplus_snippets import CppSnippet, CppEmbeddedSnippet
 
 
 class CppLanguagePlugin(BaseLanguagePlugin):
@@ -10,3 +10,11 @@ class CppLanguagePlugin(BaseLanguagePlugin):
     file_ending = "hpp"
     static_file_path = Path(__file__).parent / "static_files"
     snippets: Snippets = CppSnippet()
+
+
+class CppEmbeddedLanguagePlugin(BaseLanguagePlugin):
+    output_folder = "cplusplus_embedded"
+    default_enabled = False
+    file_ending = "hpp"
+    static_file_path = Path(__file__).parent / "embedded_static_files"
+    snippets: Snippets = CppEmbeddedSnippet()
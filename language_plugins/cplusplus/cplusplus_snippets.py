@@ -2,10 +2,30 @@ from language_plugins.base_snippets import Snippets
 from language_plugins.command_definitions import Command, CommandEntry, EntryType
 
 
+CPP_TYPES = {
+    EntryType.STRING: "std::string",
+    EntryType.INT: "int",
+    EntryType.FLOAT: "float",
+    EntryType.BOOL: "bool",
+    EntryType.INT8: "int8_t",
+    EntryType.INT16: "int16_t",
+    EntryType.INT32: "int32_t",
+    EntryType.INT64: "int64_t",
+    EntryType.UINT8: "uint8_t",
+    EntryType.UINT16: "uint16_t",
+    EntryType.UINT32: "uint32_t",
+    EntryType.UINT64: "uint64_t",
+    EntryType.FLOAT32: "float",
+    EntryType.FLOAT64: "double",
+}
+
+
 class CppSnippet(Snippets):
     indent: str = "    "
+    # Appended to every member declaration, e.g. "{}" to value-initialize
+    member_initializer: str = ""
 
-    def get_file_snippet(self, commands: list[Command]) -> str:
+    def get_file_snippet(self, commands: list[Command], depth: int = 0) -> str:
         """
         Generate the full C++ header (.hpp) file.
         """
@@ -41,8 +61,11 @@ class CppSnippet(Snippets):
             "// Auto-generated file. Do not edit manually.",
             "#pragma once",
             "",
+            "#include <array>",
+            "#include <cstdint>",
             "#include <string>",
             "#include <optional>",
+            "#include <vector>",
             "",
             "namespace GeneratedCommands",
             "{",
@@ -97,6 +120,22 @@ class CppSnippet(Snippets):
             lines.extend(self.get_entry_snippet(entry))
         return lines
 
+    def get_entry_type(self, entry: CommandEntry) -> str:
+        """
+        C++ type of a member variable.
+        """
+        cpp_type = CPP_TYPES[entry.type]
+
+        if entry.is_array:
+            if entry.array_length is not None:
+                cpp_type = f"std::array<{cpp_type}, {entry.array_length}>"
+            else:
+                cpp_type = f"std::vector<{cpp_type}>"
+
+        if entry.optional:
+            cpp_type = f"std::optional<{cpp_type}>"
+        return cpp_type
+
     def get_entry_snippet(self, entry: CommandEntry) -> list[str]:
         """
         Generate a single member variable with a block Doxygen comment.
@@ -104,15 +143,7 @@ class CppSnippet(Snippets):
         cpp_name = entry.name
         lines = []
 
-        cpp_type = {
-            EntryType.STRING: "std::string",
-            EntryType.INT: "int",
-            EntryType.FLOAT: "float",
-            EntryType.BOOL: "bool",
-        }[entry.type]
-
-        if entry.optional:
-            cpp_type = f"std::optional<{cpp_type}>"
+        cpp_type = self.get_entry_type(entry)
 
         if entry.comment:
             lines.extend([
@@ -121,5 +152,90 @@ class CppSnippet(Snippets):
                 " */"
             ])
 
-        lines.append(f"{cpp_type} {cpp_name};")
+        lines.append(f"{cpp_type} {cpp_name}{self.member_initializer};")
+        return lines
+
+
+class CppEmbeddedSnippet(CppSnippet):
+    """
+    Allocation-light C++ output for embedded targets: CRTP instead of virtual
+    dispatch, a constexpr command name instead of RTTI, and fixed-capacity
+    strings for fields with a max_length.
+    """
+    # Value-initialize every member so a default constructed command never
+    # holds indeterminate scalars
+    member_initializer = "{}"
+
+    def get_header_snippet(self) -> list[str]:
+        """
+        Generate top-of-file header.
+        """
+        return [
+            "// Auto-generated file. Do not edit manually.",
+            "#pragma once",
+            "",
+            "#include <array>",
+            "#include <cstdint>",
+            "#include <optional>",
+            "#include <string>",
+            "#include <string_view>",
+            "#include <vector>",
+            "",
+            "#include \"embedded-command.hpp\"",
+            "",
+            "namespace GeneratedCommands::Embedded",
+            "{",
+            "{commands_key}",
+            "}"
+        ]
+
+    def get_class_snippet(self, command: Command) -> list[str]:
+        """
+        Generate the C++ class definition.
+        """
+        lines = [
+            f"class {command.name} : public Command<{command.name}>",
+            "{",
+            "public:",
+            f"{self.indent}static constexpr std::string_view CommandName = \"{self.camel_to_snake(command.name)}\";",
+            "",
+        ]
+
+        lines.extend(
+            super().indent_snippet(self.get_entries_snippet(command), 1)
+        )
+        lines.append("")
+        lines.extend(
+            super().indent_snippet(self._get_visit_fields_snippet(command), 1)
+        )
+
+        lines.append("};\n")
+        return lines
+
+    def get_entry_type(self, entry: CommandEntry) -> str:
+        """
+        C++ type of a member variable. Strings with a max_length are stored
+        inline in a FixedString.
+        """
+        if entry.max_length is None:
+            return super().get_entry_type(entry)
+
+        cpp_type = f"FixedString<{entry.max_length}>"
+        if entry.optional:
+            cpp_type = f"std::optional<{cpp_type}>"
+        return cpp_type
+
+    def _get_visit_fields_snippet(self, command: Command) -> list[str]:
+        lines = [
+            "template <typename Self, typename Visitor>",
+            "static void visit_fields(Self &self, Visitor &&visitor)",
+            "{",
+        ]
+        if not command.entries:
+            lines.extend(super().indent_snippet(
+                ["(void)self;", "(void)visitor;"], 1))
+        for entry in command.entries:
+            lines.append(
+                f"{self.indent}visitor(\"{entry.name}\", self.{entry.name});")
+        lines.append("}")
         return lines
@@ -0,0 +1,108 @@
+#pragma once
+
+#include <array>
+#include <cstddef>
+#include <string_view>
+
+namespace GeneratedCommands::Embedded {
+
+/**
+ * @brief Fixed-capacity string stored inline, without heap allocation.
+ *
+ * Holds at most Capacity characters plus a terminating null so c_str() is
+ * always valid. Trivially copyable.
+ */
+template <std::size_t Capacity> class FixedString {
+public:
+  constexpr FixedString() = default;
+
+  constexpr FixedString(std::string_view value) { assign(value); }
+
+  constexpr FixedString(const char *value)
+      : FixedString(std::string_view(value)) {}
+
+  /**
+   * @brief Assign like std::string; values longer than Capacity are truncated
+   */
+  constexpr FixedString &operator=(std::string_view value) {
+    assign(value);
+    return *this;
+  }
+
+  constexpr FixedString &operator=(const char *value) {
+    return *this = std::string_view(value);
+  }
+
+  /**
+   * @brief Copy value into the string, truncating it to Capacity characters
+   * @return false if value had to be truncated
+   */
+  constexpr bool assign(std::string_view value) {
+    const std::size_t length = value.size() < Capacity ? value.size() : Capacity;
+    for (std::size_t i = 0; i < length; ++i) {
+      Data[i] = value[i];
+    }
+    Data[length] = '\0';
+    Length = length;
+    return length == value.size();
+  }
+
+  constexpr std::string_view view() const { return {Data.data(), Length}; }
+
+  constexpr operator std::string_view() const { return view(); }
+
+  constexpr const char *c_str() const { return Data.data(); }
+
+  constexpr std::size_t size() const { return Length; }
+
+  static constexpr std::size_t capacity() { return Capacity; }
+
+  constexpr bool operator==(const FixedString &other) const {
+    return view() == other.view();
+  }
+
+  constexpr bool operator!=(const FixedString &other) const {
+    return !(*this == other);
+  }
+
+private:
+  std::array<char, Capacity + 1> Data{};
+  std::size_t Length = 0;
+};
+
+/**
+ * @brief CRTP base class for all generated embedded commands.
+ *
+ * Uses no virtual functions and no RTTI, so it builds with -fno-rtti and adds
+ * nothing to the size of a command. Every generated Derived provides:
+ * - static constexpr std::string_view CommandName (snake_case)
+ * - template <typename Self, typename Visitor>
+ *   static void visit_fields(Self &self, Visitor &&visitor)
+ *   which calls visitor(name, field) for each field in declaration order,
+ *   so serializers can be written without reflection.
+ */
+template <typename Derived> class Command {
+public:
+  /**
+   * @brief Name of the command in snake_case
+   */
+  static constexpr std::string_view command_name() {
+    return Derived::CommandName;
+  }
+
+  /**
+   * @brief Call visitor(name, value) for every field
+   */
+  template <typename Visitor> void visit(Visitor &&visitor) const {
+    Derived::visit_fields(static_cast<const Derived &>(*this), visitor);
+  }
+
+  /**
+   * @brief Call visitor(name, value) for every field, allowing changes
+   */
+  template <typename Visitor> void visit(Visitor &&visitor) {
+    Derived::visit_fields(static_cast<Derived &>(*this), visitor);
+  }
+};
+
+} // namespace GeneratedCommands::Embedded
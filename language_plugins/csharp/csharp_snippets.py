@@ -5,7 +5,7 @@ from language_plugins.command_definitions import Command, CommandEntry, EntryTyp
 class CSharpSnippet(Snippets):
     indent: str = "    "
 
-    def get_file_snippet(self, commands: list[Command]) -> str:
+    def get_file_snippet(self, commands: list[Command], depth: int = 0) -> str:
         header = self.get_header_snippet()
         lines = []
         for command in commands:
@@ -77,8 +77,21 @@ class CSharpSnippet(Snippets):
             EntryType.INT: "int",
             EntryType.FLOAT: "float",
             EntryType.BOOL: "bool",
+            EntryType.INT8: "sbyte",
+            EntryType.INT16: "short",
+            EntryType.INT32: "int",
+            EntryType.INT64: "long",
+            EntryType.UINT8: "byte",
+            EntryType.UINT16: "ushort",
+            EntryType.UINT32: "uint",
+            EntryType.UINT64: "ulong",
+            EntryType.FLOAT32: "float",
+            EntryType.FLOAT64: "double",
         }[entry.type]
 
+        if entry.is_array:
+            csharp_type = f"{csharp_type}[]"
+
         if entry.optional:
             csharp_type = f"{csharp_type}?"
 
@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Generic;
 using System.Text.Json;
 using System.Text.Json.Serialization;
 using System.Text.RegularExpressions;
@@ -39,7 +40,8 @@ public abstract class Command
     public string ToJson()
     {
         var options = new JsonSerializerOptions { WriteIndented = true,
-                                                  DefaultIgnoreCondition = JsonIgnoreCondition.WhenWritingNull };
+                                                  DefaultIgnoreCondition = JsonIgnoreCondition.WhenWritingNull,
+                                                  Converters = { new ByteArrayAsNumbersConverter() } };
         return JsonSerializer.Serialize(this, options);
     }
 
@@ -49,8 +51,41 @@ public abstract class Command
     public static T FromJson<T>(string json)
         where T : Command
     {
-        var options = new JsonSerializerOptions { PropertyNameCaseInsensitive = true };
+        var options = new JsonSerializerOptions { PropertyNameCaseInsensitive = true,
+                                                  Converters = { new ByteArrayAsNumbersConverter() } };
         return JsonSerializer.Deserialize<T>(json, options);
     }
 }
+
+/// <summary>
+/// Serialize byte[] (uint8 arrays) as a JSON array of numbers instead of a
+/// base64 string, matching the other runtimes
+/// </summary>
+public class ByteArrayAsNumbersConverter : JsonConverter<byte[]>
+{
+    public override byte[] Read(ref Utf8JsonReader reader, Type typeToConvert, JsonSerializerOptions options)
+    {
+        if (reader.TokenType != JsonTokenType.StartArray)
+        {
+            throw new JsonException("Expected a JSON array for a uint8 array field.");
+        }
+
+        var values = new List<byte>();
+        while (reader.Read() && reader.TokenType != JsonTokenType.EndArray)
+        {
+            values.Add(reader.GetByte());
+        }
+        return values.ToArray();
+    }
+
+    public override void Write(Utf8JsonWriter writer, byte[] value, JsonSerializerOptions options)
+    {
+        writer.WriteStartArray();
+        foreach (byte item in value)
+        {
+            writer.WriteNumberValue(item);
+        }
+        writer.WriteEndArray();
+    }
+}
 }
@@ -2,11 +2,26 @@ from language_plugins.base_snippets import Snippets
 from language_plugins.command_definitions import Command, CommandEntry, EntryType
 
 
+# Typed array constructors for sized numeric array elements
+TYPED_ARRAYS = {
+    EntryType.INT8: "Int8Array",
+    EntryType.INT16: "Int16Array",
+    EntryType.INT32: "Int32Array",
+    EntryType.INT64: "BigInt64Array",
+    EntryType.UINT8: "Uint8Array",
+    EntryType.UINT16: "Uint16Array",
+    EntryType.UINT32: "Uint32Array",
+    EntryType.UINT64: "BigUint64Array",
+    EntryType.FLOAT32: "Float32Array",
+    EntryType.FLOAT64: "Float64Array",
+}
+
+
 class JavascriptSnippets(Snippets):
     indent: str = "    "
 
-    def get_file_snippet(self, commands: list[Command]) -> str:
-        lines = self.get_header_snippet()
+    def get_file_snippet(self, commands: list[Command], depth: int = 0) -> str:
+        lines = self.get_header_snippet(depth)
         for command in commands:
             lines.extend(self.get_command_snippet(command))
         lines.extend(self._get_footer_snippet(commands))
@@ -18,10 +33,11 @@ class JavascriptSnippets(Snippets):
 
         return lines
 
-    def get_header_snippet(self):
+    def get_header_snippet(self, depth: int = 0):
+        base_dir = "../" * depth if depth else "./"
         lines = [
             "// Auto-generated file. Do not edit manually.",
-            "import { Command } from './BaseCommand.js';",
+            f"import {{ Command }} from '{base_dir}BaseCommand.js';",
             "",
         ]
         return lines
@@ -39,6 +55,8 @@ class JavascriptSnippets(Snippets):
         lines = [
             f"class {command.name} extends Command {{",
         ]
+        lines.extend(super().indent_snippet(
+            self._get_typed_arrays_snippet(command), 1))
         lines.extend(super().indent_snippet(
             self.get_entries_snippet(command), 1))
         lines.append("}\n")
@@ -73,6 +91,18 @@ class JavascriptSnippets(Snippets):
         lines.append(f"this.{csharp_name} = null;")
         return lines
 
+    def _get_typed_arrays_snippet(self, command: Command) -> list[str]:
+        array_entries = [entry for entry in command.entries if entry.is_array]
+        if not array_entries:
+            return []
+
+        lines = ["static typedArrays = {"]
+        for entry in array_entries:
+            lines.append(
+                f"{self.indent}{Snippets.camel_to_snake(entry.name)}: {TYPED_ARRAYS[entry.type]},")
+        lines.append("};")
+        return lines
+
     def _get_footer_snippet(self, commands: list[Command]) -> list[str]:
         command_names: list[str] = [command.name for command in commands]
         return [
@@ -16,7 +16,8 @@ export class Command {
      * Serialize this command to a JSON string
      */
     toJson() {
-        return JSON.stringify(this, null, 4);
+        return JSON.stringify(this, typedArrayReplacer, 4)
+            .replace(BIGINT_PLACEHOLDER, '$1');
     }
 
     /**
@@ -25,9 +26,54 @@ export class Command {
      * @param {Function} cls - The class to instantiate
      */
     static fromJson(json, cls) {
-        const obj = JSON.parse(json);
+        const obj = JSON.parse(quoteBigIntArrays(json, cls.typedArrays ?? {}));
         const instance = new cls();
         Object.assign(instance, obj);
+
+        // Rebuild typed array fields declared by the generated class
+        for (const [key, ArrayType] of Object.entries(cls.typedArrays ?? {})) {
+            const values = instance[key];
+            if (!Array.isArray(values)) {
+                continue;
+            }
+            instance[key] = isBigIntArray(ArrayType) ? ArrayType.from(values, v => BigInt(v)) : ArrayType.from(values);
+        }
         return instance;
     }
 }
+
+// 64-bit elements do not fit in a Number. typedArrayReplacer writes them as
+// marked strings which toJson() then turns back into exact integer text
+const BIGINT_MARKER = '\u0000bigint:';
+const BIGINT_PLACEHOLDER = /"\\u0000bigint:(-?\d+)"/g;
+
+function isBigIntArray(ArrayType) {
+    return ArrayType === BigInt64Array || ArrayType === BigUint64Array;
+}
+
+/**
+ * JSON.stringify replacer writing typed arrays as plain number arrays
+ */
+function typedArrayReplacer(key, value) {
+    if (ArrayBuffer.isView(value)) {
+        return Array.from(value, v => typeof v === 'bigint' ? BIGINT_MARKER + v : v);
+    }
+    return value;
+}
+
+/**
+ * Quote the elements of 64-bit array fields so JSON.parse keeps every digit
+ * instead of rounding them to a Number
+ */
+function quoteBigIntArrays(json, typedArrays) {
+    for (const [key, ArrayType] of Object.entries(typedArrays)) {
+        if (!isBigIntArray(ArrayType)) {
+            continue;
+        }
+        // Quotes inside JSON strings are escaped, so this only matches keys
+        const field = new RegExp(`([{,]\\s*"${key}"\\s*:\\s*\\[)([^\\]]*)\\]`, 'g');
+        json = json.replace(field, (_, start, values) =>
+            `${start}${values.replace(/[^\s,]+/g, '"$&"')}]`);
+    }
+    return json;
+}
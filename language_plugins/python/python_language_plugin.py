@@ -1,12 +1,37 @@
-from pathlib import Path
+import keyword
+from pathlib import Path, PurePosixPath
+from typing import Dict
 
 from language_plugins.base_language_plugin import BaseLanguagePlugin
 from language_plugins.base_snippets import Snippets
+from language_plugins.command_definitions import Command
 from .python_snippets import PythonSnippets
 
 
 class PythonLanguagePlugin(BaseLanguagePlugin):
     output_folder = "python"
-    file_ending = ".py"
+    file_ending = "py"
     static_file_path = Path(__file__).parent / "static_files"
     snippets: Snippets = PythonSnippets()
+
+    def _generate_code(self, all_json_data: Dict[str, list[Command]]) -> Dict[str, str]:
+        output_files = super()._generate_code(all_json_data)
+
+        # Nested source folders become sub-packages
+        for source_filename in all_json_data:
+            for package in PurePosixPath(source_filename).parents:
+                if package == PurePosixPath("."):
+                    continue
+                if not package.name.isidentifier() or keyword.iskeyword(package.name):
+                    raise ValueError(
+                        f"Folder '{package}' of source '{source_filename}' is not a valid Python "
+                        "package name. Use a valid identifier or exclude it.")
+                output_files.setdefault(f"{package}/__init__.py", "")
+
+        return output_files
+
+
+class PythonCompactLanguagePlugin(PythonLanguagePlugin):
+    output_folder = "python_compact"
+    default_enabled = False
+    snippets: Snippets = PythonSnippets(compact=True)
@@ -2,11 +2,34 @@ from language_plugins.base_snippets import Snippets
 from language_plugins.command_definitions import Command, CommandEntry, EntryType
 
 
+# array.array typecodes for sized numeric array elements
+ARRAY_TYPECODES = {
+    EntryType.INT8: "b",
+    EntryType.INT16: "h",
+    EntryType.INT32: "i",
+    EntryType.INT64: "q",
+    EntryType.UINT8: "B",
+    EntryType.UINT16: "H",
+    EntryType.UINT32: "I",
+    EntryType.UINT64: "Q",
+    EntryType.FLOAT32: "f",
+    EntryType.FLOAT64: "d",
+}
+
+
 class PythonSnippets(Snippets):
     indent: str = "    "
 
-    def get_file_snippet(self, commands: list[Command]) -> str:
-        lines = self.get_header_snippet()
+    def __init__(self, compact: bool = False):
+        """
+        Args:
+            compact (bool): Generate `slots=True` dataclasses with the command
+                name as a class attribute and interned string values.
+        """
+        self.compact = compact
+
+    def get_file_snippet(self, commands: list[Command], depth: int = 0) -> str:
+        lines = self.get_header_snippet(commands, depth)
         for command in commands:
             lines.extend(self.get_command_snippet(command))
 
@@ -21,15 +44,22 @@ class PythonSnippets(Snippets):
         lines.append("\n")
         return lines
 
-    def get_header_snippet(self):
-        lines = [
-            "from dataclasses import dataclass",
-            "from typing import Optional",
-            "from .base_command import Command",
+    def get_header_snippet(self, commands: list[Command] | None = None, depth: int = 0):
+        uses_arrays = any(
+            entry.is_array for command in commands or [] for entry in command.entries)
+
+        typing_imports = "ClassVar, Optional" if self.compact else "Optional"
+        lines = []
+        if uses_arrays:
+            lines.append("from array import array")
+        lines.extend([
+            "from dataclasses import dataclass, field" if uses_arrays else "from dataclasses import dataclass",
+            f"from typing import {typing_imports}",
+            f"from .{'.' * depth}base_command import Command",
             "",
             "# This file is auto-generated. Do not edit manually.",
             "",
-        ]
+        ])
         return lines
 
     def get_about_snippet(self, command: Command) -> list[str]:
@@ -44,16 +74,21 @@ class PythonSnippets(Snippets):
 
     def get_class_snippet(self, command: Command) -> list[str]:
         lines = [
-            "@dataclass",
+            "@dataclass(slots=True)" if self.compact else "@dataclass",
             f"class {command.name}(Command):"
         ]
         return lines
 
     def get_entries_snippet(self, command: Command) -> list[str]:
-        if not command.entries:
+        lines = []
+        if self.compact:
+            lines.extend([
+                f'command_name: ClassVar[str] = "{self.camel_to_snake(command.name)}"',
+                "_intern_strings: ClassVar[bool] = True",
+            ])
+        elif not command.entries:
             return ["pass"]
 
-        lines = []
         for entry in command.entries:
             lines.extend(self.get_entry_snippet(entry))
         return lines
@@ -63,12 +98,18 @@ class PythonSnippets(Snippets):
 
         lines = []
 
-        py_type = {
-            EntryType.STRING: "str",
-            EntryType.INT: "int",
-            EntryType.FLOAT: "float",
-            EntryType.BOOL: "bool",
-        }[entry.type]
+        if entry.is_array:
+            py_type = "array"
+        elif entry.type in (EntryType.FLOAT, EntryType.FLOAT32, EntryType.FLOAT64):
+            py_type = "float"
+        elif entry.type.is_sized_numeric:
+            py_type = "int"
+        else:
+            py_type = {
+                EntryType.STRING: "str",
+                EntryType.INT: "int",
+                EntryType.BOOL: "bool",
+            }[entry.type]
 
         if entry.optional:
             py_type = f"Optional[{py_type}]"
@@ -76,5 +117,14 @@ class PythonSnippets(Snippets):
         if entry.comment:
             lines.append(f"# {entry.comment}")
 
-        lines.append(f"{python_name}: {py_type}")
+        if entry.is_array:
+            # The base Command converts JSON lists to array.array using this
+            metadata = f'{{"typecode": "{ARRAY_TYPECODES[entry.type]}"'
+            if entry.array_length is not None:
+                metadata += f', "length": {entry.array_length}'
+            metadata += "}"
+            lines.append(
+                f"{python_name}: {py_type} = field(metadata={metadata})")
+        else:
+            lines.append(f"{python_name}: {py_type}")
         return lines
@@ -1,41 +1,125 @@
 import json
 import re
+import sys
+from array import array
 from dataclasses import asdict, fields, is_dataclass
-from typing import Type, TypeVar, Any
+from functools import lru_cache
+from typing import ClassVar, Optional, Type, TypeVar, Any
 
 T = TypeVar("T", bound="Command")
 
 
+@lru_cache(maxsize=None)
+def _field_layout(cls: type) -> tuple[frozenset[str], dict[str, tuple[str, Optional[int]]]]:
+    """
+    Field names of a command class, and the (typecode, fixed length) of each
+    array field as declared in the generated field metadata.
+    """
+    class_fields = fields(cls)
+    arrays = {
+        f.name: (f.metadata["typecode"], f.metadata.get("length"))
+        for f in class_fields if "typecode" in f.metadata
+    }
+    return frozenset(f.name for f in class_fields), arrays
+
+
+def _json_dict_factory(items: list[tuple[str, Any]]) -> dict[str, Any]:
+    return {k: v.tolist() if isinstance(v, array) else v for k, v in items}
+
+
 class Command:
     """
     Base class for all generated commands.
     Provides:
     - automatic JSON serialization/deserialization
     - a command_name field in snake_case matching the class name
+
+    Compact generated classes use `slots=True` and define command_name as a
+    class attribute, so they carry no per-instance `__dict__`.
     """
 
+    __slots__ = ()
+
     command_name: str
 
+    # When True, decoded string values are interned so repeated values share
+    # one object
+    _intern_strings: ClassVar[bool] = False
+
     def __post_init__(self):
         # Set command_name automatically from the class name
         if not hasattr(self, "command_name") or self.command_name is None:
             self.command_name = self._class_name_to_snake()
 
-    def _class_name_to_snake(self) -> str:
-        name = self.__class__.__name__
+    @classmethod
+    def _class_name_to_snake(cls) -> str:
+        name = cls.__name__
 
         s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
         s2 = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1)
         return s2.lower()
 
-    def to_json(self) -> str:
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert this command instance into a dict of its fields.
+        Array fields are returned as lists so the dict is JSON serializable.
+        """
+        if not is_dataclass(self):
+            raise TypeError(
+                f"{self.__class__.__name__} must be a dataclass to use to_dict()")
+        return asdict(self, dict_factory=_json_dict_factory)
+
+    @classmethod
+    def from_dict(cls: Type[T], data: dict[str, Any]) -> T:
+        """
+        Create an instance of the command from a dict of its fields.
+        Unknown keys are ignored.
+        """
+        if not is_dataclass(cls):
+            raise TypeError(
+                f"{cls.__name__} must be a dataclass to use from_dict()")
+        return cls(**cls._decode_fields(data))
+
+    @classmethod
+    def _decode_fields(cls, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Keep only the keys that are fields of this command, interning string
+        values if the class asks for it and converting lists to array.array
+        for array fields.
+        """
+        field_names, arrays = _field_layout(cls)
+        if cls._intern_strings:
+            decoded = {
+                k: sys.intern(v) if type(v) is str else v
+                for k, v in data.items() if k in field_names
+            }
+        else:
+            decoded = {k: v for k, v in data.items() if k in field_names}
+
+        for name, (typecode, length) in arrays.items():
+            value = decoded.get(name)
+            if value is None:
+                continue
+            if not isinstance(value, array):
+                value = decoded[name] = array(typecode, value)
+            if length is not None and len(value) != length:
+                raise ValueError(
+                    f"Field '{name}' of {cls.__name__} must have {length} elements, got {len(value)}.")
+        return decoded
+
+    def to_json(self, indent: Optional[int] = 4) -> str:
         """
         Convert this command instance into a JSON string.
+        command_name is written first so readers can route on it without
+        parsing the whole message. Pass `indent=None` for compact output.
         """
         if not is_dataclass(self):
             raise TypeError(
                 f"{self.__class__.__name__} must be a dataclass to use to_json()")
-        return json.dumps(asdict(self), ensure_ascii=False, indent=4)
+        data = {"command_name": self.command_name, **self.to_dict()}
+        if indent is None:
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(data, ensure_ascii=False, indent=indent)
 
     @classmethod
     def from_json(cls: Type[T], json_str: str) -> T:
@@ -45,7 +129,4 @@ class Command:
         if not is_dataclass(cls):
             raise TypeError(
                 f"{cls.__name__} must be a dataclass to use from_json()")
-        data = json.loads(json_str)
-        field_names = {f.name for f in fields(cls)}
-        filtered_data = {k: v for k, v in data.items() if k in field_names}
-        return cls(**filtered_data)
+        return cls.from_dict(json.loads(json_str))
@@ -0,0 +1,381 @@
+import json
+import lzma
+import mmap
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+from .base_command import Command
+from .lazy import LazyCommand
+
+# File layout:
+#   header   magic, format version, compression id
+#   blocks   block header, command names, compressed records; back to back
+#   index    compact JSON describing every block
+#   trailer  offset of the index, magic
+#
+# Block header: magic, compressed length (uint64), record count (uint32),
+# min and max timestamp (float64), length of the command names (uint32),
+# followed by the command names as a compact JSON list. The index repeats
+# this information; when a writer crashed before writing it, the reader
+# rebuilds it by scanning the block headers.
+#
+# Uncompressed record layout inside a block:
+#   timestamp (float64), name length (uint16), payload length (uint32),
+#   name bytes, payload bytes
+_MAGIC = b"JCLOG\x00"
+_INDEX_MAGIC = b"JIDX"
+_BLOCK_MAGIC = b"JBLK"
+_VERSION = 2
+_HEADER = struct.Struct("<6sBB")
+_BLOCK_HEADER = struct.Struct("<4sQIddI")
+_TRAILER = struct.Struct("<Q4s")
+_RECORD = struct.Struct("<dHI")
+
+_COMPRESSION_IDS = {"none": 0, "zlib": 1, "lzma": 2}
+_COMPRESSION_NAMES = {v: k for k, v in _COMPRESSION_IDS.items()}
+
+
+def _compress(data: bytes, compression: str, level: Optional[int]) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(data, -1 if level is None else level)
+    if compression == "lzma":
+        return lzma.compress(data, preset=level)
+    return data
+
+
+def _decompress(data: memoryview, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "lzma":
+        return lzma.decompress(data)
+    return bytes(data)
+
+
+class LogRecord(NamedTuple):
+    timestamp: float
+    command_name: str
+    payload: bytes
+
+    def lazy(self) -> LazyCommand:
+        """
+        Wrap the payload in a LazyCommand without parsing it.
+        """
+        return LazyCommand(self.payload)
+
+
+@dataclass
+class BlockInfo:
+    offset: int
+    length: int
+    record_count: int
+    min_timestamp: float
+    max_timestamp: float
+    command_names: frozenset[str]
+
+
+class CommandLogWriter:
+    """
+    Appends encoded commands to a block-compressed, indexed log file.
+
+    Records are buffered in memory and written as one compressed block once
+    `block_size` uncompressed bytes are buffered. The block index is written
+    by `close()`. If the writer never gets there (e.g. the process crashed),
+    the reader rebuilds the index from the block headers, so only records
+    not yet flushed are lost.
+    """
+
+    def __init__(self, path: Union[str, Path], compression: str = "zlib",
+                 block_size: int = 1 << 20, level: Optional[int] = None):
+        if compression not in _COMPRESSION_IDS:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of {sorted(_COMPRESSION_IDS)}.")
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}.")
+
+        self.path = Path(path)
+        self.compression = compression
+        self.block_size = block_size
+        self.level = level
+
+        self._file = self.path.open("wb")
+        self._file.write(_HEADER.pack(
+            _MAGIC, _VERSION, _COMPRESSION_IDS[compression]))
+
+        self._blocks: list[BlockInfo] = []
+        self._buffer = bytearray()
+        self._buffer_count = 0
+        self._buffer_names: set[str] = set()
+        self._buffer_min = float("inf")
+        self._buffer_max = float("-inf")
+
+    def append(self, command: Command, timestamp: Optional[float] = None) -> None:
+        """
+        Append a command, encoded as compact JSON.
+        `timestamp` defaults to the current time.
+        """
+        self.append_raw(command.command_name,
+                        command.to_json(indent=None).encode("utf-8"),
+                        timestamp)
+
+    def append_raw(self, command_name: str, payload: bytes,
+                   timestamp: Optional[float] = None) -> None:
+        """
+        Append an already encoded command payload.
+        """
+        if self._file.closed:
+            raise ValueError("Cannot append to a closed command log.")
+        if timestamp is None:
+            timestamp = time.time()
+
+        name = command_name.encode("utf-8")
+        self._buffer += _RECORD.pack(timestamp, len(name), len(payload))
+        self._buffer += name
+        self._buffer += payload
+
+        self._buffer_count += 1
+        self._buffer_names.add(command_name)
+        self._buffer_min = min(self._buffer_min, timestamp)
+        self._buffer_max = max(self._buffer_max, timestamp)
+
+        if len(self._buffer) >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write any buffered records as a new block and flush it to the
+        operating system.
+        """
+        if not self._buffer_count:
+            return
+
+        block = _compress(bytes(self._buffer), self.compression, self.level)
+        names = json.dumps(sorted(self._buffer_names), separators=(",", ":")).encode("utf-8")
+        header = _BLOCK_HEADER.pack(
+            _BLOCK_MAGIC, len(block), self._buffer_count,
+            self._buffer_min, self._buffer_max, len(names))
+
+        self._blocks.append(BlockInfo(
+            offset=self._file.tell() + len(header) + len(names),
+            length=len(block),
+            record_count=self._buffer_count,
+            min_timestamp=self._buffer_min,
+            max_timestamp=self._buffer_max,
+            command_names=frozenset(self._buffer_names),
+        ))
+        self._file.write(header + names + block)
+        self._file.flush()
+
+        self._buffer.clear()
+        self._buffer_count = 0
+        self._buffer_names.clear()
+        self._buffer_min = float("inf")
+        self._buffer_max = float("-inf")
+
+    def close(self) -> None:
+        """
+        Flush the last block and write the index.
+        """
+        if self._file.closed:
+            return
+        self.flush()
+
+        # Store command names once and refer to them by position
+        names = sorted({n for block in self._blocks for n in block.command_names})
+        name_ids = {name: i for i, name in enumerate(names)}
+        index = {
+            "command_names": names,
+            "blocks": [
+                [b.offset, b.length, b.record_count, b.min_timestamp,
+                 b.max_timestamp, sorted(name_ids[n] for n in b.command_names)]
+                for b in self._blocks
+            ],
+        }
+
+        index_offset = self._file.tell()
+        self._file.write(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+        self._file.write(_TRAILER.pack(index_offset, _INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> "CommandLogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CommandLogReader:
+    """
+    Reads a command log through `mmap`.
+
+    Only the blocks whose index entry matches the requested command names
+    and time range are decompressed. `recovered` is True when the log had
+    no index and it was rebuilt from the block headers.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{self.path}' is not a command log.") from None
+
+        try:
+            self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self) -> None:
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"'{self.path}' is not a command log.")
+
+        magic, version, compression_id = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"'{self.path}' is not a command log.")
+        if version != _VERSION:
+            raise ValueError(
+                f"Unsupported command log version {version} in '{self.path}'.")
+        self.compression = _COMPRESSION_NAMES[compression_id]
+
+        blocks = self._load_index()
+        self.recovered = blocks is None
+        if blocks is None:
+            blocks = self._scan_blocks()
+        self.blocks: list[BlockInfo] = blocks
+
+        # Blocks containing each command type
+        names = sorted({name for block in self.blocks for name in block.command_names})
+        self.blocks_by_command: dict[str, list[int]] = {name: [] for name in names}
+        for i, block in enumerate(self.blocks):
+            for name in block.command_names:
+                self.blocks_by_command[name].append(i)
+
+    def _load_index(self) -> Optional[list[BlockInfo]]:
+        """
+        Read the index written by `CommandLogWriter.close()`, or return None
+        if the log has none.
+        """
+        end = len(self._map) - _TRAILER.size
+        if end < _HEADER.size:
+            return None
+        index_offset, index_magic = _TRAILER.unpack_from(self._map, end)
+        if index_magic != _INDEX_MAGIC or not _HEADER.size <= index_offset <= end:
+            return None
+        try:
+            index = json.loads(self._map[index_offset:end])
+        except ValueError:
+            return None
+
+        names = index["command_names"]
+        return [
+            BlockInfo(
+                offset=offset,
+                length=length,
+                record_count=record_count,
+                min_timestamp=min_timestamp,
+                max_timestamp=max_timestamp,
+                command_names=frozenset(names[i] for i in name_ids),
+            )
+            for offset, length, record_count, min_timestamp, max_timestamp, name_ids
+            in index["blocks"]
+        ]
+
+    def _scan_blocks(self) -> list[BlockInfo]:
+        """
+        Rebuild the index from the block headers. Scanning stops at the
+        first block that was not completely written.
+        """
+        blocks = []
+        position = _HEADER.size
+        end = len(self._map)
+        while position + _BLOCK_HEADER.size <= end:
+            magic, length, record_count, min_timestamp, max_timestamp, names_length = \
+                _BLOCK_HEADER.unpack_from(self._map, position)
+            names_offset = position + _BLOCK_HEADER.size
+            data_offset = names_offset + names_length
+            if magic != _BLOCK_MAGIC or data_offset + length > end:
+                break
+            try:
+                names = json.loads(self._map[names_offset:data_offset])
+            except ValueError:
+                break
+
+            blocks.append(BlockInfo(
+                offset=data_offset,
+                length=length,
+                record_count=record_count,
+                min_timestamp=min_timestamp,
+                max_timestamp=max_timestamp,
+                command_names=frozenset(names),
+            ))
+            position = data_offset + length
+        return blocks
+
+    @property
+    def command_names(self) -> list[str]:
+        return list(self.blocks_by_command)
+
+    def __len__(self) -> int:
+        return sum(block.record_count for block in self.blocks)
+
+    def read(self, command_names: Optional[Iterable[str]] = None,
+             start: Optional[float] = None,
+             end: Optional[float] = None) -> Iterator[LogRecord]:
+        """
+        Yield records in file order, optionally only those of the given
+        command types and with `start <= timestamp < end`.
+        """
+        wanted = None if command_names is None else frozenset(command_names)
+
+        if wanted is None:
+            block_ids: Iterable[int] = range(len(self.blocks))
+        else:
+            block_ids = sorted({
+                i for name in wanted for i in self.blocks_by_command.get(name, ())
+            })
+
+        for i in block_ids:
+            block = self.blocks[i]
+            if start is not None and block.max_timestamp < start:
+                continue
+            if end is not None and block.min_timestamp >= end:
+                continue
+            yield from self._read_block(block, wanted, start, end)
+
+    def _read_block(self, block: BlockInfo, wanted: Optional[frozenset[str]],
+                    start: Optional[float], end: Optional[float]) -> Iterator[LogRecord]:
+        data = _decompress(
+            memoryview(self._map)[block.offset:block.offset + block.length],
+            self.compression)
+
+        position = 0
+        for _ in range(block.record_count):
+            timestamp, name_length, payload_length = _RECORD.unpack_from(
+                data, position)
+            position += _RECORD.size
+            name = data[position:position + name_length].decode("utf-8")
+            position += name_length
+            payload_end = position + payload_length
+
+            if ((wanted is None or name in wanted)
+                    and (start is None or timestamp >= start)
+                    and (end is None or timestamp < end)):
+                yield LogRecord(timestamp, name, data[position:payload_end])
+            position = payload_end
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "CommandLogReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
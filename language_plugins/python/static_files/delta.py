@@ -0,0 +1,142 @@
+import json
+from typing import Any, Type, TypeVar, Union
+
+from .base_command import Command
+
+T = TypeVar("T", bound=Command)
+
+
+class DeltaSyncError(ValueError):
+    """
+    Raised when a delta message cannot be applied because the decoder has
+    missed the keyframe or an earlier delta for that command type.
+    The decoder recovers on the next keyframe.
+    """
+
+
+class DeltaEncoder:
+    """
+    Stateful field-level delta encoder for one channel.
+
+    Each message only carries the fields that changed since the previous
+    message of the same command type. A full keyframe is sent for the first
+    message of each command type and then every `keyframe_interval` messages
+    so that a decoder which joins late or drops a message can resync.
+
+    Message layout:
+        {"command_name": str, "seq": int, "keyframe": bool, "fields": {...}}
+    """
+
+    def __init__(self, keyframe_interval: int = 100):
+        if keyframe_interval < 1:
+            raise ValueError(
+                f"keyframe_interval must be at least 1, got {keyframe_interval}.")
+        self.keyframe_interval = keyframe_interval
+        self._last_fields: dict[str, dict[str, Any]] = {}
+        self._seq: dict[str, int] = {}
+
+    def encode(self, command: Command) -> str:
+        """
+        Encode a command as a delta (or keyframe) JSON string.
+        """
+        return json.dumps(self.encode_message(command), ensure_ascii=False, separators=(",", ":"))
+
+    def encode_message(self, command: Command) -> dict[str, Any]:
+        """
+        Encode a command as a delta (or keyframe) message dict.
+        """
+        name = command.command_name
+        current = command.to_dict()
+        previous = self._last_fields.get(name)
+        seq = self._seq.get(name, -1) + 1
+
+        keyframe = (
+            previous is None
+            or seq % self.keyframe_interval == 0
+            or previous.keys() != current.keys()
+        )
+        if keyframe:
+            changed = current
+        else:
+            changed = {k: v for k, v in current.items() if previous[k] != v}
+
+        self._last_fields[name] = current
+        self._seq[name] = seq
+        return {"command_name": name, "seq": seq, "keyframe": keyframe, "fields": changed}
+
+    def reset(self, command_name: str | None = None) -> None:
+        """
+        Forget the encoder state so the next message is sent as a keyframe.
+        Resets every command type when `command_name` is None.
+        """
+        if command_name is None:
+            self._last_fields.clear()
+            self._seq.clear()
+        else:
+            self._last_fields.pop(command_name, None)
+            self._seq.pop(command_name, None)
+
+
+class DeltaDecoder:
+    """
+    Stateful decoder matching a single DeltaEncoder channel.
+    Rebuilds the full field set of each message from the last keyframe and
+    the deltas received since.
+    """
+
+    def __init__(self):
+        self._state: dict[str, dict[str, Any]] = {}
+        self._seq: dict[str, int] = {}
+
+    def decode(self, message: Union[str, bytes]) -> tuple[str, dict[str, Any]]:
+        """
+        Decode a delta JSON string into (command_name, full field dict).
+        """
+        return self.decode_message(json.loads(message))
+
+    def decode_message(self, message: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        """
+        Decode a delta message dict into (command_name, full field dict).
+        """
+        name: str = message["command_name"]
+        seq: int = message["seq"]
+
+        if message["keyframe"]:
+            state = dict(message["fields"])
+        else:
+            previous = self._state.get(name)
+            if previous is None or self._seq[name] != seq - 1:
+                # Drop the stale state so only a keyframe can resync this type
+                self._state.pop(name, None)
+                self._seq.pop(name, None)
+                raise DeltaSyncError(
+                    f"Missing keyframe or delta for '{name}' before seq {seq}.")
+            state = dict(previous)
+            state.update(message["fields"])
+
+        self._state[name] = state
+        self._seq[name] = seq
+        return name, dict(state)
+
+    def decode_as(self, cls: Type[T], message: Union[str, bytes]) -> T:
+        """
+        Decode a delta JSON string into an instance of `cls`.
+        Raises ValueError if the message is for another command type.
+        """
+        name, data = self.decode(message)
+        expected = getattr(cls, "command_name", None) or cls._class_name_to_snake()
+        if name != expected:
+            raise ValueError(
+                f"Delta message is for '{name}', expected '{expected}' ({cls.__name__}).")
+        return cls.from_dict(data)
+
+    def reset(self, command_name: str | None = None) -> None:
+        """
+        Forget the decoder state for one or every command type.
+        """
+        if command_name is None:
+            self._state.clear()
+            self._seq.clear()
+        else:
+            self._state.pop(command_name, None)
+            self._seq.pop(command_name, None)
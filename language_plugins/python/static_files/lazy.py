@@ -0,0 +1,124 @@
+import json
+import re
+from typing import Any, Type, TypeVar, Union
+
+from .base_command import Command
+
+T = TypeVar("T", bound=Command)
+
+_MISSING = object()
+
+# Every '"' inside a JSON string is escaped, so a quote directly after '{' or
+# ',' always starts a key of the (flat) top-level object.
+_KEY_PATTERN = r'[{{,]\s*"{key}"\s*:\s*'
+
+# Key each runtime writes the command name under: Python, JavaScript, C#/C++
+COMMAND_NAME_KEYS = ("command_name", "commandName", "CommandName")
+_COMMAND_NAME_PATTERN = re.compile(
+    _KEY_PATTERN.format(key="(?:" + "|".join(COMMAND_NAME_KEYS) + ")")
+    + r'"((?:[^"\\]|\\.)*)"')
+_COMMAND_NAME_PATTERN_BYTES = re.compile(
+    _COMMAND_NAME_PATTERN.pattern.encode("ascii"))
+_DECODER = json.JSONDecoder()
+
+
+class LazyCommand:
+    """
+    Read-only view of an encoded command that defers parsing.
+
+    - `command_name` is found with a single scan of the raw message.
+    - Single fields are decoded on access without building the command.
+    - `materialize()` builds the full dataclass only when it is needed.
+    - `raw` / `to_bytes()` give back the original message untouched, so
+      forwarding does not re-encode.
+    """
+
+    __slots__ = ("raw", "_text", "_data", "_command_name")
+
+    def __init__(self, raw: Union[str, bytes]):
+        self.raw = raw
+        self._text: str | None = raw if isinstance(raw, str) else None
+        self._data: dict[str, Any] | None = None
+        self._command_name: str | None = None
+
+    @property
+    def command_name(self) -> str:
+        """
+        The snake_case command name, read without parsing the message.
+        Messages from any runtime are accepted (see COMMAND_NAME_KEYS).
+        """
+        if self._command_name is None:
+            if isinstance(self.raw, str):
+                match = _COMMAND_NAME_PATTERN.search(self.raw)
+            else:
+                match = _COMMAND_NAME_PATTERN_BYTES.search(self.raw)
+            if match is None:
+                raise ValueError(
+                    f"Message has no command name (expected one of {COMMAND_NAME_KEYS}).")
+
+            name = match.group(1)
+            if isinstance(name, bytes):
+                name = name.decode("utf-8")
+            if "\\" in name:
+                name = json.loads(f'"{name}"')
+            self._command_name = name
+        return self._command_name
+
+    def get(self, field_name: str, default: Any = _MISSING) -> Any:
+        """
+        Decode a single field. Returns `default` if the field is absent, or
+        raises KeyError when no default is given.
+        """
+        if self._data is not None:
+            value = self._data.get(field_name, default)
+        else:
+            text = self._get_text()
+            match = re.search(
+                _KEY_PATTERN.format(key=re.escape(field_name)), text)
+            if match is None:
+                value = default
+            else:
+                value, _ = _DECODER.raw_decode(text, match.end())
+
+        if value is _MISSING:
+            raise KeyError(field_name)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError:
+            raise AttributeError(
+                f"Message '{self.command_name}' has no field '{name}'") from None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Parse the whole message into a dict. The result is cached.
+        """
+        if self._data is None:
+            self._data = json.loads(self.raw)
+        return self._data
+
+    def materialize(self, cls: Type[T]) -> T:
+        """
+        Build the full command instance of type `cls`.
+        """
+        return cls.from_dict(self.to_dict())
+
+    def to_bytes(self) -> bytes:
+        """
+        The original message as UTF-8 bytes, for passthrough.
+        """
+        if isinstance(self.raw, bytes):
+            return self.raw
+        return self.raw.encode("utf-8")
+
+    def _get_text(self) -> str:
+        if self._text is None:
+            self._text = self.raw.decode("utf-8")
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"LazyCommand(command_name={self.command_name!r}, size={len(self.raw)})"
@@ -0,0 +1,251 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+from .base_command import Command
+
+# Opt-in metrics for encoding and decoding commands.
+#
+# enable() swaps instrumented versions of every encode entry point
+# (to_json(), and to_dict() used by DeltaEncoder) and decode entry point
+# (from_json(), from_dict() and _decode_fields(), which CommandPool,
+# LazyCommand.materialize() and DeltaDecoder.decode_as() go through) onto the
+# Command base class. disable() puts the originals back, so there is no cost
+# at all while metrics are off. Nested calls such as from_json() ->
+# from_dict() are recorded once.
+
+LATENCY_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2,
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+METRIC_PREFIX = "generated_commands"
+
+_original_to_json = Command.to_json
+_original_to_dict = Command.to_dict
+_original_from_json = Command.from_json.__func__
+_original_from_dict = Command.from_dict.__func__
+_original_decode_fields = Command._decode_fields.__func__
+
+
+@dataclass
+class OperationStats:
+    """
+    Metrics of one operation ("encode" or "decode") on one command type.
+    Bucket lists hold per-bucket (not cumulative) counts, with a final
+    overflow bucket. Encodes to and decodes from a dict have no payload
+    size, so the size histogram only covers `sized_count` of the `count`
+    operations.
+    """
+    count: int = 0
+    sized_count: int = 0
+    bytes_total: int = 0
+    latency_total: float = 0.0
+    latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    size_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(SIZE_BUCKETS) + 1))
+
+
+_lock = threading.Lock()
+_stats: dict[tuple[str, str], OperationStats] = {}
+_enabled = False
+_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _command_name(cls: type) -> str:
+    return getattr(cls, "command_name", None) or cls._class_name_to_snake()
+
+
+def _payload_size(payload: Union[str, bytes]) -> int:
+    if isinstance(payload, str) and not payload.isascii():
+        return len(payload.encode("utf-8"))
+    return len(payload)
+
+
+def _record(operation: str, command_name: str, payload: Optional[Union[str, bytes]],
+            elapsed: float) -> None:
+    size = None if payload is None else _payload_size(payload)
+    with _lock:
+        stats = _stats.get((operation, command_name))
+        if stats is None:
+            stats = _stats[(operation, command_name)] = OperationStats()
+        stats.count += 1
+        stats.latency_total += elapsed
+        stats.latency_buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        if size is not None:
+            stats.sized_count += 1
+            stats.bytes_total += size
+            stats.size_buckets[bisect_left(SIZE_BUCKETS, size)] += 1
+
+
+def _timed_encode(encode, command, *args, **kwargs):
+    # to_json() calls to_dict(); only the outermost call is recorded
+    if getattr(_local, "encoding", False):
+        return encode(command, *args, **kwargs)
+
+    _local.encoding = True
+    start = time.perf_counter()
+    try:
+        result = encode(command, *args, **kwargs)
+    finally:
+        _local.encoding = False
+    payload = result if isinstance(result, str) else None
+    _record("encode", command.command_name, payload, time.perf_counter() - start)
+    return result
+
+
+def _timed_to_json(self, *args, **kwargs) -> str:
+    return _timed_encode(_original_to_json, self, *args, **kwargs)
+
+
+def _timed_to_dict(self):
+    return _timed_encode(_original_to_dict, self)
+
+
+def _timed_decode(decode, cls, data, payload: Optional[Union[str, bytes]]):
+    # Decode entry points call each other (from_json -> from_dict ->
+    # _decode_fields); only the outermost call is recorded
+    if getattr(_local, "decoding", False):
+        return decode(cls, data)
+
+    _local.decoding = True
+    start = time.perf_counter()
+    try:
+        result = decode(cls, data)
+    finally:
+        _local.decoding = False
+    _record("decode", _command_name(cls), payload, time.perf_counter() - start)
+    return result
+
+
+def _timed_from_json(cls, json_str):
+    return _timed_decode(_original_from_json, cls, json_str, json_str)
+
+
+def _timed_from_dict(cls, data):
+    return _timed_decode(_original_from_dict, cls, data, None)
+
+
+def _timed_decode_fields(cls, data):
+    return _timed_decode(_original_decode_fields, cls, data, None)
+
+
+def enable() -> None:
+    """
+    Start recording encode/decode metrics for every command type.
+    """
+    global _enabled
+    Command.to_json = _timed_to_json
+    Command.to_dict = _timed_to_dict
+    Command.from_json = classmethod(_timed_from_json)
+    Command.from_dict = classmethod(_timed_from_dict)
+    Command._decode_fields = classmethod(_timed_decode_fields)
+    _enabled = True
+
+
+def disable() -> None:
+    """
+    Stop recording. Metrics recorded so far are kept.
+    """
+    global _enabled
+    Command.to_json = _original_to_json
+    Command.to_dict = _original_to_dict
+    Command.from_json = classmethod(_original_from_json)
+    Command.from_dict = classmethod(_original_from_dict)
+    Command._decode_fields = classmethod(_original_decode_fields)
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """
+    Drop all recorded metrics.
+    """
+    with _lock:
+        _stats.clear()
+
+
+def snapshot() -> dict[tuple[str, str], OperationStats]:
+    """
+    Copy of the current metrics keyed by (operation, command_name).
+    """
+    with _lock:
+        return {
+            key: replace(stats,
+                         latency_buckets=list(stats.latency_buckets),
+                         size_buckets=list(stats.size_buckets))
+            for key, stats in _stats.items()
+        }
+
+
+def _histogram_lines(name: str, labels: str, bounds: tuple, buckets: list[int],
+                     total: float, count: int) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(bounds, buckets):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+
+def to_prometheus() -> str:
+    """
+    Render the current metrics in the Prometheus text exposition format.
+    """
+    stats = sorted(snapshot().items())
+    operations = f"{METRIC_PREFIX}_operations_total"
+    size = f"{METRIC_PREFIX}_size_bytes"
+    latency = f"{METRIC_PREFIX}_latency_seconds"
+
+    lines = [
+        f"# HELP {operations} Number of encode/decode calls per command type.",
+        f"# TYPE {operations} counter",
+    ]
+    for (operation, command_name), s in stats:
+        lines.append(
+            f'{operations}{{command="{command_name}",operation="{operation}"}} {s.count}')
+
+    lines.extend([
+        f"# HELP {size} Size of encoded/decoded payloads in bytes.",
+        f"# TYPE {size} histogram",
+    ])
+    for (operation, command_name), s in stats:
+        lines.extend(_histogram_lines(
+            size, f'command="{command_name}",operation="{operation}"',
+            SIZE_BUCKETS, s.size_buckets, s.bytes_total, s.sized_count))
+
+    lines.extend([
+        f"# HELP {latency} Time spent encoding/decoding commands.",
+        f"# TYPE {latency} histogram",
+    ])
+    for (operation, command_name), s in stats:
+        lines.extend(_histogram_lines(
+            latency, f'command="{command_name}",operation="{operation}"',
+            LATENCY_BUCKETS, s.latency_buckets, s.latency_total, s.count))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: Union[str, Path]) -> None:
+    """
+    Write the Prometheus text to `path`, replacing it atomically so scrapers
+    such as the node_exporter textfile collector never see a partial file.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(to_prometheus(), encoding="utf-8")
+    os.replace(tmp_path, path)
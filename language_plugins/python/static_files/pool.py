@@ -0,0 +1,65 @@
+import json
+from dataclasses import fields
+from typing import Any, Generic, Type, TypeVar
+
+from .base_command import Command
+
+T = TypeVar("T", bound=Command)
+
+
+class CommandPool(Generic[T]):
+    """
+    Free list of instances of a single command class for hot decode loops.
+
+    Released instances are reused by `from_dict()`/`from_json()` instead of
+    allocating new objects. Callers must not keep references to an instance
+    after releasing it.
+    """
+
+    def __init__(self, cls: Type[T], max_size: int = 1024):
+        if max_size < 0:
+            raise ValueError(f"max_size must not be negative, got {max_size}.")
+        self.cls = cls
+        self.max_size = max_size
+        self._field_names = frozenset(f.name for f in fields(cls))
+        self._free: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self, **field_values: Any) -> T:
+        """
+        Return an instance with the given field values, reusing a released
+        instance when one is available.
+        """
+        if not self._free or field_values.keys() != self._field_names:
+            # Let the constructor report missing or unexpected fields
+            return self.cls(**field_values)
+
+        instance = self._free.pop()
+        for name, value in field_values.items():
+            setattr(instance, name, value)
+        return instance
+
+    def release(self, instance: T) -> None:
+        """
+        Return an instance to the pool. Instances beyond `max_size` are
+        dropped.
+        """
+        if type(instance) is not self.cls:
+            raise TypeError(
+                f"Expected a {self.cls.__name__}, got {type(instance).__name__}.")
+        if len(self._free) < self.max_size:
+            self._free.append(instance)
+
+    def from_dict(self, data: dict[str, Any]) -> T:
+        """
+        Same as `cls.from_dict()` but reuses pooled instances.
+        """
+        return self.acquire(**self.cls._decode_fields(data))
+
+    def from_json(self, json_str: str) -> T:
+        """
+        Same as `cls.from_json()` but reuses pooled instances.
+        """
+        return self.from_dict(json.loads(json_str))
@@ -0,0 +1,309 @@
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, Optional
+
+from .base_command import Command
+from .lazy import LazyCommand
+
+# Shared memory layout:
+#   [0, 64)     producer line: head (uint64), magic, capacity (uint64)
+#   [64, 128)   consumer line: tail (uint64)
+#   [128, ...)  data area of `capacity` bytes
+#
+# head and tail are byte counters that only grow; the position in the data
+# area is counter % capacity. Each one is written by a single side only.
+# Records are a uint32 length followed by the payload, padded to 8 bytes so
+# a length never straddles the end of the data area. When a record does not
+# fit before the end, a padding marker is written and the record starts at 0.
+# Records are limited to half the data area so that a wrapped record always
+# fits once the consumer has caught up.
+_MAGIC = b"JCRING\x00\x01"
+_HEAD_OFFSET = 0
+_MAGIC_OFFSET = 8
+_CAPACITY_OFFSET = 16
+_TAIL_OFFSET = 64
+_DATA_OFFSET = 128
+
+_COUNTER = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_PADDING_MARKER = 0xFFFFFFFF
+_ALIGNMENT = 8
+
+_WAIT_STRATEGIES = ("spin", "backoff")
+
+
+def _record_size(payload_length: int) -> int:
+    size = _LENGTH.size + payload_length
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class RingBuffer:
+    """
+    Single-producer/single-consumer ring buffer over shared memory.
+
+    One process creates the buffer with `create()` and shares its `name`;
+    the other side attaches with `attach()`. Exactly one process may put and
+    exactly one may get.
+
+    Waiting:
+    - `try_put()` / `try_get()` never wait (polling).
+    - `put()` / `get()` wait up to `timeout` seconds (forever if None) using
+      the buffer's wait strategy: "spin" yields the CPU between checks,
+      "backoff" sleeps with exponentially growing intervals up to `max_sleep`.
+    - `put_many()` / `get_many()` move a batch while publishing the shared
+      counters only once.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool,
+                 wait: str = "backoff", max_sleep: float = 0.001):
+        if wait not in _WAIT_STRATEGIES:
+            raise ValueError(
+                f"Unknown wait strategy '{wait}', expected one of {_WAIT_STRATEGIES}.")
+
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        self.wait = wait
+        self.max_sleep = max_sleep
+
+        if bytes(self._buf[_MAGIC_OFFSET:_MAGIC_OFFSET + len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"Shared memory '{shm.name}' is not a ring buffer.")
+        self.capacity: int = _COUNTER.unpack_from(self._buf, _CAPACITY_OFFSET)[0]
+
+        # Local copies of the counters this side owns
+        self._head = self._load(_HEAD_OFFSET)
+        self._tail = self._load(_TAIL_OFFSET)
+
+    @classmethod
+    def create(cls, capacity: int, name: Optional[str] = None, **kwargs) -> "RingBuffer":
+        """
+        Allocate a new ring buffer with a data area of at least `capacity`
+        bytes. Single payloads may use up to half of it.
+        """
+        if capacity < _ALIGNMENT * 2:
+            raise ValueError(f"capacity must be at least {_ALIGNMENT * 2}, got {capacity}.")
+        capacity = _record_size(capacity - _LENGTH.size)
+
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_DATA_OFFSET + capacity)
+        shm.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+        shm.buf[_MAGIC_OFFSET:_MAGIC_OFFSET + len(_MAGIC)] = _MAGIC
+        _COUNTER.pack_into(shm.buf, _CAPACITY_OFFSET, capacity)
+        return cls(shm, owner=True, **kwargs)
+
+    @classmethod
+    def attach(cls, name: str, track: bool = True, **kwargs) -> "RingBuffer":
+        """
+        Attach to a ring buffer created by another process.
+
+        `track` mirrors `SharedMemory(track=...)` of Python 3.13: a tracked
+        segment is unlinked by this process's resource tracker when it
+        exits. Pass `track=False` from independently started programs so
+        the segment outlives them. Keep the default in children started by
+        the creator with multiprocessing, which share its resource tracker.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=track)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if not track and os.name == "posix":
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False, **kwargs)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def max_payload_size(self) -> int:
+        return self.capacity // 2 // _ALIGNMENT * _ALIGNMENT - _LENGTH.size
+
+    def _load(self, offset: int) -> int:
+        return _COUNTER.unpack_from(self._buf, offset)[0]
+
+    def _wait_until(self, ready, timeout: Optional[float]) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sleep = 1e-6
+        while not ready():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("Timed out waiting on the ring buffer.")
+            if self.wait == "spin":
+                time.sleep(0)
+            else:
+                time.sleep(sleep)
+                sleep = min(sleep * 2, self.max_sleep)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def _space_needed(self, payload_length: int) -> int:
+        size = _record_size(payload_length)
+        if payload_length > self.max_payload_size:
+            raise ValueError(
+                f"Payload of {payload_length} bytes exceeds the ring buffer maximum of {self.max_payload_size}.")
+        contiguous = self.capacity - self._head % self.capacity
+        return size if size <= contiguous else contiguous + size
+
+    def _has_space(self, needed: int) -> bool:
+        return self.capacity - (self._head - self._load(_TAIL_OFFSET)) >= needed
+
+    def _write(self, payload: bytes) -> None:
+        size = _record_size(len(payload))
+        position = self._head % self.capacity
+        contiguous = self.capacity - position
+        if size > contiguous:
+            _LENGTH.pack_into(self._buf, _DATA_OFFSET + position, _PADDING_MARKER)
+            self._head += contiguous
+            position = 0
+
+        start = _DATA_OFFSET + position
+        _LENGTH.pack_into(self._buf, start, len(payload))
+        self._buf[start + _LENGTH.size:start + _LENGTH.size + len(payload)] = payload
+        self._head += size
+
+    def _publish_head(self) -> None:
+        _COUNTER.pack_into(self._buf, _HEAD_OFFSET, self._head)
+
+    def try_put(self, payload: bytes) -> bool:
+        """
+        Put a payload if there is room. Returns False if the buffer is full.
+        """
+        if not self._has_space(self._space_needed(len(payload))):
+            return False
+        self._write(payload)
+        self._publish_head()
+        return True
+
+    def put(self, payload: bytes, timeout: Optional[float] = None) -> None:
+        """
+        Put a payload, waiting for room if the buffer is full.
+        """
+        needed = self._space_needed(len(payload))
+        self._wait_until(lambda: self._has_space(needed), timeout)
+        self._write(payload)
+        self._publish_head()
+
+    def put_many(self, payloads: Iterable[bytes], timeout: Optional[float] = None) -> int:
+        """
+        Put several payloads, publishing them together whenever possible.
+        Returns the number of payloads written.
+        """
+        count = 0
+        try:
+            for payload in payloads:
+                needed = self._space_needed(len(payload))
+                if not self._has_space(needed):
+                    # Let the consumer see what is written so far before waiting
+                    self._publish_head()
+                    self._wait_until(lambda: self._has_space(needed), timeout)
+                self._write(payload)
+                count += 1
+        finally:
+            self._publish_head()
+        return count
+
+    def send(self, command: Command, timeout: Optional[float] = None) -> None:
+        """
+        Encode a command as compact JSON and put it.
+        """
+        self.put(command.to_json(indent=None).encode("utf-8"), timeout)
+
+    def send_many(self, commands: Iterable[Command], timeout: Optional[float] = None) -> int:
+        """
+        Encode and put several commands as one batch.
+        """
+        return self.put_many(
+            (command.to_json(indent=None).encode("utf-8") for command in commands),
+            timeout)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _has_data(self) -> bool:
+        return self._load(_HEAD_OFFSET) != self._tail
+
+    def _read(self) -> bytes:
+        position = self._tail % self.capacity
+        length = _LENGTH.unpack_from(self._buf, _DATA_OFFSET + position)[0]
+        if length == _PADDING_MARKER:
+            self._tail += self.capacity - position
+            position = 0
+            length = _LENGTH.unpack_from(self._buf, _DATA_OFFSET)[0]
+
+        start = _DATA_OFFSET + position + _LENGTH.size
+        payload = bytes(self._buf[start:start + length])
+        self._tail += _record_size(length)
+        return payload
+
+    def _publish_tail(self) -> None:
+        _COUNTER.pack_into(self._buf, _TAIL_OFFSET, self._tail)
+
+    def try_get(self) -> Optional[bytes]:
+        """
+        Get the next payload, or None if the buffer is empty.
+        """
+        if not self._has_data():
+            return None
+        payload = self._read()
+        self._publish_tail()
+        return payload
+
+    def get(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Get the next payload, waiting for one if the buffer is empty.
+        """
+        self._wait_until(self._has_data, timeout)
+        payload = self._read()
+        self._publish_tail()
+        return payload
+
+    def get_many(self, max_count: int, timeout: Optional[float] = None) -> list[bytes]:
+        """
+        Wait for at least one payload, then take up to `max_count` available
+        payloads at once.
+        """
+        self._wait_until(self._has_data, timeout)
+        head = self._load(_HEAD_OFFSET)
+        payloads = []
+        while self._tail != head and len(payloads) < max_count:
+            payloads.append(self._read())
+        self._publish_tail()
+        return payloads
+
+    def receive(self, timeout: Optional[float] = None) -> LazyCommand:
+        """
+        Get the next command as a LazyCommand.
+        """
+        return LazyCommand(self.get(timeout))
+
+    def receive_many(self, max_count: int, timeout: Optional[float] = None) -> list[LazyCommand]:
+        """
+        Get up to `max_count` available commands as LazyCommands.
+        """
+        return [LazyCommand(payload) for payload in self.get_many(max_count, timeout)]
+
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory. The creator also frees it.
+        """
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                # Already removed by someone else
+                pass
+
+    def __enter__(self) -> "RingBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
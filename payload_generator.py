@@ -0,0 +1,383 @@
+import sys
+import json
+import math
+import random
+import string
+import struct
+import argparse
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+from builder import SchemaCache, gather_json_files
+from language_plugins.base_snippets import Snippets
+from language_plugins.command_definitions import Command, CommandEntry, EntryType
+from language_plugins.python.static_files.command_log import CommandLogWriter
+
+LengthDistribution = Callable[[random.Random], int]
+ValueGenerator = Callable[[random.Random], Any]
+
+STRING_ALPHABET = string.ascii_letters + string.digits
+
+INTEGER_RANGES = {
+    EntryType.INT: (-2**31, 2**31 - 1),
+    EntryType.INT8: (-2**7, 2**7 - 1),
+    EntryType.INT16: (-2**15, 2**15 - 1),
+    EntryType.INT32: (-2**31, 2**31 - 1),
+    EntryType.INT64: (-2**63, 2**63 - 1),
+    EntryType.UINT8: (0, 2**8 - 1),
+    EntryType.UINT16: (0, 2**16 - 1),
+    EntryType.UINT32: (0, 2**32 - 1),
+    EntryType.UINT64: (0, 2**64 - 1),
+}
+FLOAT_RANGE = (-1e6, 1e6)
+
+# Records are written to the output in chunks of this many
+WRITE_CHUNK = 4096
+
+
+def parse_length_distribution(spec: str) -> LengthDistribution:
+    """
+    Parse a length distribution such as "fixed:8", "uniform:0:32",
+    "normal:16:4" or "exponential:16" (mean).
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(":")] if params else []
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid length distribution '{spec}'.") from None
+
+    def invalid(reason: str) -> argparse.ArgumentTypeError:
+        return argparse.ArgumentTypeError(
+            f"Invalid length distribution '{spec}': {reason}.")
+
+    if not all(math.isfinite(v) and v >= 0 for v in values):
+        raise invalid("parameters must be finite and not negative")
+
+    if kind == "fixed" and len(values) == 1:
+        if not values[0].is_integer():
+            raise invalid("N must be a whole number")
+        length = int(values[0])
+        return lambda rng: length
+    if kind == "uniform" and len(values) == 2:
+        if not (values[0].is_integer() and values[1].is_integer()):
+            raise invalid("MIN and MAX must be whole numbers")
+        low, high = int(values[0]), int(values[1])
+        if low > high:
+            raise invalid("MIN must not be greater than MAX")
+        return lambda rng: rng.randint(low, high)
+    if kind == "normal" and len(values) == 2:
+        mean, std = values
+        return lambda rng: max(0, round(rng.gauss(mean, std)))
+    if kind == "exponential" and len(values) == 1:
+        if values[0] == 0:
+            raise invalid("MEAN must be positive")
+        rate = 1 / values[0]
+        return lambda rng: int(rng.expovariate(rate))
+
+    raise argparse.ArgumentTypeError(
+        f"Invalid length distribution '{spec}'. Expected fixed:N, uniform:MIN:MAX, "
+        "normal:MEAN:STD or exponential:MEAN.")
+
+
+def _float32(value: float) -> float:
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+def _scalar_generator(entry: CommandEntry, string_length: LengthDistribution) -> ValueGenerator:
+    if entry.type == EntryType.STRING:
+        max_length = entry.max_length
+
+        def generate_string(rng: random.Random) -> str:
+            length = string_length(rng)
+            if max_length is not None:
+                length = min(length, max_length)
+            return "".join(rng.choices(STRING_ALPHABET, k=length))
+        return generate_string
+
+    if entry.type == EntryType.BOOL:
+        return lambda rng: rng.random() < 0.5
+
+    if entry.type == EntryType.FLOAT32:
+        return lambda rng: _float32(rng.uniform(*FLOAT_RANGE))
+
+    if entry.type in (EntryType.FLOAT, EntryType.FLOAT64):
+        return lambda rng: rng.uniform(*FLOAT_RANGE)
+
+    low, high = INTEGER_RANGES[entry.type]
+    return lambda rng: rng.randint(low, high)
+
+
+def build_field_generator(entry: CommandEntry, optional_density: float,
+                          string_length: LengthDistribution,
+                          array_length: LengthDistribution) -> ValueGenerator:
+    """
+    Build a function producing random valid values for one field.
+    """
+    element = _scalar_generator(entry, string_length)
+
+    if entry.is_array:
+        fixed_length = entry.array_length
+
+        def generate(rng: random.Random) -> Any:
+            length = fixed_length if fixed_length is not None else array_length(rng)
+            return [element(rng) for _ in range(length)]
+    else:
+        generate = element
+
+    if not entry.optional:
+        return generate
+
+    def generate_optional(rng: random.Random) -> Any:
+        return generate(rng) if rng.random() < optional_density else None
+    return generate_optional
+
+
+def select_commands(parsed_json_data: dict[str, list[Command]],
+                    selection: list[str] | None = None) -> list[Command]:
+    """
+    Pick the commands to generate: all of them, or those named in
+    `selection` by class name, optionally qualified by source key
+    ("team_a/motors:MotorCommand").
+    Raises if two picked commands share a command_name, since their
+    messages could not be told apart.
+    """
+    available = [(key, command) for key, commands in parsed_json_data.items()
+                 for command in commands]
+
+    if selection:
+        picked: set[int] = set()
+        for item in selection:
+            key, _, name = item.rpartition(":")
+            matches = [i for i, (k, command) in enumerate(available)
+                       if command.name == name and (not key or k == key)]
+            if not matches:
+                raise ValueError(f"Unknown command '{item}'.")
+            picked.update(matches)
+        available = [available[i] for i in sorted(picked)]
+
+    sources: dict[str, list[str]] = {}
+    for key, command in available:
+        sources.setdefault(Snippets.camel_to_snake(command.name), []).append(
+            f"{key}:{command.name}")
+    duplicates = {name: found for name, found in sources.items() if len(found) > 1}
+    if duplicates:
+        details = "; ".join(
+            f"'{name}' in {', '.join(found)}" for name, found in sorted(duplicates.items()))
+        raise ValueError(
+            f"Several commands share the same command_name: {details}. "
+            "Pick one with -c SOURCE:NAME or --exclude the other files.")
+
+    return [command for _, command in available]
+
+
+def generate_records(commands: list[Command], count: int, seed: int,
+                     optional_density: float, string_length: LengthDistribution,
+                     array_length: LengthDistribution,
+                     snake_case_fields: bool = True) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Yield `count` (command_name, message) pairs, picking commands uniformly.
+    The same arguments always produce the same records.
+    """
+    rng = random.Random(seed)
+
+    templates = []
+    for command in commands:
+        fields = [
+            (Snippets.camel_to_snake(entry.name) if snake_case_fields else entry.name,
+             build_field_generator(entry, optional_density, string_length, array_length))
+            for entry in command.entries
+        ]
+        templates.append((Snippets.camel_to_snake(command.name), fields))
+
+    for _ in range(count):
+        command_name, fields = rng.choice(templates)
+        message = {"command_name": command_name}
+        for field_name, generate in fields:
+            message[field_name] = generate(rng)
+        yield command_name, message
+
+
+def write_ndjson(records: Iterator[tuple[str, dict[str, Any]]], output: BinaryIO) -> int:
+    """
+    Write one compact JSON message per line. Returns the number written.
+    """
+    written = 0
+    chunk: list[str] = []
+    for _, message in records:
+        chunk.append(json.dumps(message, separators=(",", ":")))
+        if len(chunk) >= WRITE_CHUNK:
+            output.write(("\n".join(chunk) + "\n").encode("utf-8"))
+            written += len(chunk)
+            chunk.clear()
+    if chunk:
+        output.write(("\n".join(chunk) + "\n").encode("utf-8"))
+        written += len(chunk)
+    return written
+
+
+def write_command_log(records: Iterator[tuple[str, dict[str, Any]]], path: Path,
+                      compression: str, start_time: float, rate: float) -> int:
+    """
+    Write the messages to a command log (see the Python runtime's
+    command_log module), timestamped `1 / rate` seconds apart.
+    Returns the number written.
+    """
+    written = 0
+    with CommandLogWriter(path, compression=compression) as writer:
+        for command_name, message in records:
+            writer.append_raw(
+                command_name,
+                json.dumps(message, separators=(",", ":")).encode("utf-8"),
+                start_time + written / rate)
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Generate a deterministic corpus of valid command messages from command JSON files.\n"
+            "Messages match the JSON written by the generated runtimes' to_json()."
+        ),
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "-s", "--source",
+        required=True,
+        type=Path,
+        help="Path to the source JSON file or folder containing JSON files"
+    )
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Search the source folder recursively"
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="Glob of source files to use. May be repeated. Default: *.json"
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Glob of source files to skip. May be repeated"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="-",
+        help="Output file. Default: stdout (ndjson only)"
+    )
+    parser.add_argument(
+        "-f", "--format",
+        choices=["ndjson", "binary"],
+        default="ndjson",
+        help=(
+            "ndjson: one JSON message per line\n"
+            "binary: indexed, compressed command log readable with CommandLogReader"
+        )
+    )
+    parser.add_argument(
+        "-n", "--count",
+        type=int,
+        default=1000,
+        help="Number of messages to generate (default: 1000)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed. The same seed and options give the same output (default: 0)"
+    )
+    parser.add_argument(
+        "-c", "--command",
+        action="append",
+        help=(
+            "Only generate this command: a class name, or SOURCE:NAME to pick it\n"
+            "from one source file (e.g. team_a/motors:MotorCommand). May be repeated"
+        )
+    )
+    parser.add_argument(
+        "--optional-density",
+        type=float,
+        default=0.5,
+        help="Probability that an optional field is set instead of null (default: 0.5)"
+    )
+    parser.add_argument(
+        "--string-length",
+        type=parse_length_distribution,
+        default="uniform:0:32",
+        help=(
+            "Distribution of string lengths: fixed:N, uniform:MIN:MAX,\n"
+            "normal:MEAN:STD or exponential:MEAN (default: uniform:0:32).\n"
+            "Lengths are capped at a field's max_length"
+        )
+    )
+    parser.add_argument(
+        "--array-length",
+        type=parse_length_distribution,
+        default="uniform:0:64",
+        help="Distribution of variable array lengths, same syntax (default: uniform:0:64)"
+    )
+    parser.add_argument(
+        "--field-names",
+        choices=["snake", "original"],
+        default="snake",
+        help="Use snake_case field names like the Python/JS runtimes, or the names in the JSON"
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["zlib", "lzma", "none"],
+        default="zlib",
+        help="Block compression of the binary format (default: zlib)"
+    )
+    parser.add_argument(
+        "--start-time",
+        type=float,
+        default=0.0,
+        help="Timestamp of the first message in the binary format (default: 0)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1000.0,
+        help="Messages per second used for binary format timestamps (default: 1000)"
+    )
+
+    args = parser.parse_args()
+
+    if not 0.0 <= args.optional_density <= 1.0:
+        parser.error("--optional-density must be between 0 and 1")
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    if args.format == "binary" and args.output == "-":
+        parser.error("the binary format needs an --output file")
+
+    json_files = gather_json_files(
+        args.source, args.recursive, args.include, args.exclude)
+    parsed_json_data = SchemaCache().load(json_files)
+    commands = select_commands(parsed_json_data, args.command)
+    if not commands:
+        raise ValueError("No commands found in the source JSON.")
+
+    records = generate_records(
+        commands, args.count, args.seed, args.optional_density,
+        args.string_length, args.array_length, args.field_names == "snake")
+
+    if args.format == "binary":
+        written = write_command_log(
+            records, Path(args.output), args.compression, args.start_time, args.rate)
+    elif args.output == "-":
+        written = write_ndjson(records, sys.stdout.buffer)
+    else:
+        with open(args.output, "wb") as output:
+            written = write_ndjson(records, output)
+
+    print(f"Wrote {written} messages.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()